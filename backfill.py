@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from transform import TARGET_IMAGE_WIDTH, image_url_at_width
+
+# A WriteBatch takes at most 500 writes, so a page is committed in one batch
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_WORKERS = 8
+DRY_RUN_SAMPLES = 10
+
+
+class Backfill:
+    """
+    Applies an update function to every document of a (filtered) collection.
+
+    Documents are read in pages ordered by document ID, each page's updates are
+    committed as one WriteBatch on a thread pool while the next page is read.
+    `update_fn` returns None for documents that need no change, which makes
+    reruns cheap as long as it is idempotent. The ID of the last page whose
+    batch (and every batch before it) committed is saved to `progress_path`,
+    so an interrupted backfill resumes where it stopped.
+
+        Backfill(db, "vendors", resize_images_update, filters=[("extracted", "==", True)], fields=["images"]).run()
+    """
+
+    def __init__(self, db, collection_name: str, update_fn, filters=(), fields=None, page_size: int = DEFAULT_PAGE_SIZE,
+                 workers: int = DEFAULT_WORKERS, dry_run: bool = False, progress_path: str = None):
+        """
+        :param db: The Firestore client.
+        :param collection_name: The collection to backfill.
+        :param update_fn: Function taking the document data and returning the fields to update, or None.
+        :param filters: List of (field, operator, value) where clauses.
+        :param fields: Fields to read (projection), None for the whole document.
+        :param page_size: Documents read and committed at a time (at most 500).
+        :param workers: Number of batches committed in parallel.
+        :param dry_run: Only report what would change, nothing is written.
+        :param progress_path: JSON file holding the resume cursor, defaults to `backfill_<collection>.json`.
+        """
+        self.db = db
+        self.collection_name = collection_name
+        self.update_fn = update_fn
+        self.filters = list(filters)
+        self.fields = fields
+        self.page_size = min(page_size, DEFAULT_PAGE_SIZE)
+        self.workers = workers
+        self.dry_run = dry_run
+        self.progress_path = progress_path or f"backfill_{collection_name}.json"
+        self.stats = {"scanned": 0, "changed": 0, "skipped": 0, "committed": 0, "failed": 0}
+        self._last_doc_id = None
+        self._cursor_frozen = False
+
+    def _query(self):
+        # The SDK is only loaded when a backfill runs, not by modules importing the update functions
+        from firebase_admin import firestore
+
+        query = self.db.collection(self.collection_name)
+        for field, operator, value in self.filters:
+            query = query.where(field, operator, value)
+        if self.fields:
+            query = query.select(self.fields)
+        return query.order_by(firestore.FieldPath.document_id()).limit(self.page_size)
+
+    def _pages(self, start_after_id: str = None):
+        query = self._query()
+        cursor = self.db.collection(self.collection_name).document(start_after_id).get() if start_after_id else None
+        while True:
+            docs = list((query.start_after(cursor) if cursor else query).stream())
+            if docs:
+                yield docs
+            if len(docs) < self.page_size:
+                return
+            cursor = docs[-1]
+
+    def _commit(self, updates: list) -> int:
+        batch = self.db.batch()
+        for doc_ref, data in updates:
+            batch.update(doc_ref, data)
+        batch.commit()
+        return len(updates)
+
+    def _load_progress(self) -> dict:
+        if not os.path.exists(self.progress_path):
+            return {}
+        with open(self.progress_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_progress(self):
+        tmp_path = self.progress_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"collection": self.collection_name, "last_doc_id": self._last_doc_id, **self.stats}, f)
+        os.replace(tmp_path, self.progress_path)
+
+    def _retire(self, page: tuple):
+        future, last_doc_id, count = page
+        if future is not None:
+            try:
+                future.result()
+                self.stats["committed"] += count
+            except Exception as e:
+                self.stats["failed"] += count
+                # Later pages still run, but a resume must start before this one
+                self._cursor_frozen = True
+                print(f"Batch of {count} updates ending at {last_doc_id} failed: {e}")
+        if not self._cursor_frozen:
+            self._last_doc_id = last_doc_id
+            self._save_progress()
+
+    def run(self, resume: bool = False) -> dict:
+        """
+        Runs the backfill.
+
+        :param resume: Continue after the last committed page of a previous run.
+        :return: Dictionary with scanned/changed/skipped/committed/failed counts.
+        """
+        start_after_id = self._load_progress().get("last_doc_id") if resume else None
+        if start_after_id:
+            print(f"== Resuming {self.collection_name} after {start_after_id} ==")
+
+        in_flight = deque()
+        samples = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for docs in self._pages(start_after_id):
+                updates = []
+                for doc in docs:
+                    data = self.update_fn(doc.to_dict() or {})
+                    if data:
+                        updates.append((doc.reference, data))
+                    else:
+                        self.stats["skipped"] += 1
+                self.stats["scanned"] += len(docs)
+                self.stats["changed"] += len(updates)
+
+                if self.dry_run:
+                    for doc_ref, data in updates[:max(0, DRY_RUN_SAMPLES - samples)]:
+                        print(f"[dry-run] {doc_ref.path}: {data}")
+                    samples += len(updates)
+                    continue
+
+                in_flight.append((executor.submit(self._commit, updates) if updates else None, docs[-1].id, len(updates)))
+                # Retire pages in order so the saved cursor never skips a failed batch
+                while in_flight and (len(in_flight) > self.workers or in_flight[0][0] is None or in_flight[0][0].done()):
+                    self._retire(in_flight.popleft())
+                print(f"== Scanned {self.stats['scanned']} documents, {self.stats['changed']} to update ==")
+
+            while in_flight:
+                self._retire(in_flight.popleft())
+
+        # A finished backfill starts from the beginning next time
+        if not self.dry_run and not self._cursor_frozen and os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        print(f"== Backfill of {self.collection_name} done ==", self.stats)
+        return self.stats
+
+
+def resize_images_update(data: dict, width: int = TARGET_IMAGE_WIDTH):
+    """
+    Update function bringing the `images` of a vendor to the target width.
+
+    Vendors written by the first extractor.py store a single URL string, it is
+    resized and stored as a one-image list like every other vendor.
+
+    :return: {"images": [...]} or None when every image is already at the target width.
+    """
+    images = data.get("images")
+    if isinstance(images, str):
+        return {"images": [image_url_at_width(images, width)]}
+    if not isinstance(images, list):
+        return None
+    updated = [image_url_at_width(url, width) if isinstance(url, str) else url for url in images]
+    return {"images": updated} if updated != images else None
+
+
+def backfill_vendor_images(db, width: int = TARGET_IMAGE_WIDTH, workers: int = DEFAULT_WORKERS, dry_run: bool = False, resume: bool = False) -> dict:
+    """
+    Resizes the images of every extracted vendor to `width`, see resize_images_update.
+    """
+    backfill = Backfill(db, "vendors", lambda data: resize_images_update(data, width), filters=[("extracted", "==", True)],
+                        fields=["images"], workers=workers, dry_run=dry_run, progress_path="backfill_vendor_images.json")
+    return backfill.run(resume)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resize the images of all extracted vendors in Firestore.")
+    parser.add_argument("--width", type=int, default=TARGET_IMAGE_WIDTH, help="target image width in pixels")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="batches committed in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--resume", action="store_true", help="continue after the last committed page")
+    args = parser.parse_args()
+
+    from firebase_app import get_db
+
+    backfill_vendor_images(get_db(), args.width, args.workers, args.dry_run, args.resume)
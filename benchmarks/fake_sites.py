@@ -0,0 +1,110 @@
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Business {index}</title></head>
+<body>
+<header><img src="/static/logo@2x.png"><nav><a href="/site/{index}/about">About</a> <a href="/site/{index}/contact">Contact</a></nav></header>
+<main>{filler}</main>
+<footer>{contact}</footer>
+</body></html>
+"""
+
+FILLER = "<p>Fresh local produce, friendly service and great prices every day of the week.</p>\n"
+
+
+def render_site(index: int, path: str) -> str:
+    """
+    Renders a deterministic fake business page.
+
+    About a third of the sites show an email on the home page, a third only on
+    /contact and the rest have none.
+
+    :param index: The site number from the URL.
+    :param path: The remaining path ("", "/about" or "/contact").
+    :return: The HTML page.
+    """
+    rng = random.Random(index)
+    kind = index % 3
+    contact = ""
+    if (kind == 0 and path == "") or (kind == 1 and path == "/contact"):
+        contact = f'Email us: <a href="mailto:info@business{index}.co.uk">info@business{index}.co.uk</a> or bookings@business{index}.co.uk'
+    return PAGE_TEMPLATE.format(index=index, filler=FILLER * rng.randint(5, 400), contact=contact)
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self):
+        parts = self.path.split("/")
+        if len(parts) < 3 or parts[1] != "site" or not parts[2].isdigit():
+            self.send_error(404)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = render_site(int(parts[2]), "/" + "/".join(parts[3:]) if len(parts) > 3 else "").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", f'"{parts[2]}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# One hostname per business, so every site gets its own domain limiter and host semaphore
+SITE_HOST_TEMPLATE = "business{index}.localhost"
+
+
+def resolve_localhost_names():
+    """
+    Resolves every `*.localhost` name to 127.0.0.1 in this process (RFC 6761),
+    as systemd-resolved and browsers do but plain glibc does not.
+
+    Patches socket.getaddrinfo, which the requests and aiohttp default resolvers call.
+    """
+    getaddrinfo = socket.getaddrinfo
+    if getattr(getaddrinfo, "resolves_localhost", False):
+        return
+
+    def resolve(host, *args, **kwargs):
+        if isinstance(host, str) and host.lower().rstrip(".").endswith(".localhost"):
+            host = "127.0.0.1"
+        return getaddrinfo(host, *args, **kwargs)
+
+    resolve.resolves_localhost = True
+    socket.getaddrinfo = resolve
+
+
+def site_base_url(server) -> str:
+    """
+    :param server: The server returned by start_fake_sites.
+    :return: Base URL template of the sites, "{index}" is the site number (see synthetic_corpus).
+    """
+    return f"http://{SITE_HOST_TEMPLATE}:{server.server_address[1]}"
+
+
+def start_fake_sites(port: int = 8765, latency: float = 0.0):
+    """
+    Starts the fake business site server in a background thread.
+
+    Every site is served by the same server, whatever hostname it is requested
+    under, so sites can be addressed as business<n>.localhost (see site_base_url).
+
+    :param port: Port to listen on (0 picks a free one).
+    :param latency: Seconds each response is delayed, to mimic slow small-business hosting.
+    :return: The running server, call shutdown() when done.
+    """
+    handler = type("Handler", (FakeSiteHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
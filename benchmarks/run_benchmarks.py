@@ -0,0 +1,320 @@
+"""
+Offline benchmarks for the extraction pipeline.
+
+Generates a synthetic G-Maps export, serves fake business sites locally and
+replaces Firestore/FCM with in-memory stubs, so every stage can be measured
+without touching production or the live web. Results are appended to
+benchmarks/results.jsonl together with the git commit they were measured on.
+
+    python benchmarks/run_benchmarks.py --rows 10000
+    python benchmarks/run_benchmarks.py --rows 10000 --compare
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_sites import render_site, resolve_localhost_names, site_base_url, start_fake_sites  # noqa: E402
+from stubs import GeoPoint, SERVER_TIMESTAMP, StubFirestore, StubMessaging  # noqa: E402
+from synthetic_corpus import generate_corpus  # noqa: E402
+
+RESULTS_FILE = os.path.join(BENCH_DIR, "results.jsonl")
+
+
+def percentile(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Stage:
+    """
+    Collects per-call latencies of one pipeline stage.
+    """
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.samples = []
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def add(self, seconds: float, rows: int = 1):
+        self.samples.append(seconds)
+        self.rows += rows
+
+    def summary(self) -> dict:
+        total = sum(self.samples)
+        return {
+            "unit": self.unit,
+            "calls": len(self.samples),
+            "rows": self.rows,
+            "rows_per_sec": round(self.rows / total, 1) if total else None,
+            "p50_ms": round(percentile(self.samples, 0.50) * 1000, 3),
+            "p99_ms": round(percentile(self.samples, 0.99) * 1000, 3),
+            "total_s": round(total, 3),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def bench_csv_and_transform(corpus: str, chunksize: int, stages: dict):
+    from csv_stream import iter_csv_chunks
+    from transform import UK_POSTCODE_PATTERN, extract_postcodes, resize_google_image_urls, transform_chunk
+
+    columns = ["Name", "Description", "Categories", "Fulladdress", "Phone", "Phones", "Featured Image", "Latitude", "Longitude", "Street", "Website", "Place Id", "Opening Hours"]
+    load = stages["csv_load"] = Stage("csv_load", "chunk")
+    transform = stages["transform"] = Stage("transform", "chunk")
+    resize = stages["resize_image"] = Stage("resize_image", "chunk")
+    postcode_vec = stages["postcode_vectorized"] = Stage("postcode_vectorized", "chunk")
+    postcode_re = stages["postcode_regex"] = Stage("postcode_regex", "row")
+    pattern = re.compile(UK_POSTCODE_PATTERN)
+
+    chunks = iter_csv_chunks(corpus, columns, chunksize)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        load.add(time.perf_counter() - start, len(chunk))
+
+        start = time.perf_counter()
+        resize_google_image_urls(chunk["Featured Image"])
+        resize.add(time.perf_counter() - start, len(chunk))
+
+        start = time.perf_counter()
+        extract_postcodes(chunk["Fulladdress"])
+        postcode_vec.add(time.perf_counter() - start, len(chunk))
+
+        for address in chunk["Fulladdress"]:
+            start = time.perf_counter()
+            pattern.search(address)
+            postcode_re.add(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        transform_chunk(chunk)
+        transform.add(time.perf_counter() - start, len(chunk))
+        yield chunk
+
+
+def bench_opening_hours(chunks: list, stages: dict):
+    from opening_hours import _compile, compile_opening_hours, opening_hours_cache_info
+
+    _compile.cache_clear()
+    stage = stages["opening_hours"] = Stage("opening_hours", "row")
+    for chunk in chunks:
+        for hours in chunk["Hours Key"]:
+            start = time.perf_counter()
+            compile_opening_hours(hours)
+            stage.add(time.perf_counter() - start)
+    info = opening_hours_cache_info()
+    stage.extra = {"hits": info.hits, "misses": info.misses}
+
+
+def bench_dedupe(chunks: list, stages: dict, fuzzy_rows: int):
+    from vendor_index import VendorIndex
+
+    index = VendorIndex(fuzzy=True)
+    seen = 0
+    exact = stages["dedupe_exact"] = Stage("dedupe_exact", "row")
+    fuzzy = stages["dedupe_fuzzy"] = Stage("dedupe_fuzzy", "row")
+    for chunk in chunks:
+        for name in chunk["Name"]:
+            start = time.perf_counter()
+            exists = name in index
+            exact.add(time.perf_counter() - start)
+
+            # Fuzzy lookups grow with the index, only sample the first rows
+            if seen < fuzzy_rows:
+                start = time.perf_counter()
+                index.find_similar(name)
+                fuzzy.add(time.perf_counter() - start)
+            seen += 1
+            if not exists:
+                index.add(name)
+
+
+def bench_firestore_writes(rows: int, rtt: float, stages: dict):
+    from firestore_batch import BatchWriter
+
+    db = StubFirestore(rtt)
+    writer = BatchWriter(db)
+    stage = stages["firestore_write"] = Stage("firestore_write", "row")
+    for _ in range(rows):
+        vendor_ref = db.collection("vendors").document()
+        notification_ref = db.collection("userNotifications").document()
+        start = time.perf_counter()
+        writer.set_group([(vendor_ref, {"uid": vendor_ref.id}), (notification_ref, {"redirectLink": vendor_ref.id})])
+        stage.add(time.perf_counter() - start)
+    start = time.perf_counter()
+    writer.flush()
+    stage.add(time.perf_counter() - start, 0)
+    stage.extra = {"commits": db.commits}
+
+
+def bench_email_fetch(websites: list, stages: dict):
+    from email_harvest import AsyncEmailHarvester
+
+    stage = stages["email_fetch"] = Stage("email_fetch", "site")
+    harvester = AsyncEmailHarvester()
+    fetch_text = harvester.fetch_text
+
+    async def timed_fetch(session, url):
+        start = time.perf_counter()
+        try:
+            return await fetch_text(session, url)
+        finally:
+            stage.add(time.perf_counter() - start)
+
+    harvester.fetch_text = timed_fetch
+    start = time.perf_counter()
+    results = asyncio.run(harvester.harvest(websites))
+    wall = time.perf_counter() - start
+    stage.extra = {"wall_s": round(wall, 3), "sites_per_sec": round(len(websites) / wall, 1) if wall else None,
+                   "emails_found": sum(1 for email, _ in results.values() if email)}
+
+
+def bench_email_scan(pages: int, stages: dict):
+    from email_scanner import emails_from_page
+
+    stage = stages["email_scan"] = Stage("email_scan", "page")
+    html_pages = [render_site(index, "") for index in range(pages)]
+    for html in html_pages:
+        start = time.perf_counter()
+        emails_from_page(html)
+        stage.add(time.perf_counter() - start)
+    stage.extra = {"mb_per_sec": round(sum(len(h) for h in html_pages) / sum(stage.samples) / 1e6, 1)}
+
+
+def bench_end_to_end(corpus: str, rtt: float, stages: dict):
+    try:
+        import extractor2
+    except ImportError as e:
+        stages["end_to_end"] = {"skipped": str(e)}
+        return
+
+    db = StubFirestore(rtt)
+    messaging = StubMessaging(rtt)
+
+    class StubFirestoreModule:
+        SERVER_TIMESTAMP = SERVER_TIMESTAMP
+        GeoPoint = GeoPoint
+        client = staticmethod(lambda: db)
+
+    extractor2.firestore = StubFirestoreModule
+    extractor2.messaging = messaging
+    extractor2.init_firebase = lambda: None
+    # Place ID lookups would start a real browser, answer them as "no website"
+    extractor2.lookup_website_from_place_id = lambda place_id: (None, "no_website")
+
+    stage = Stage("end_to_end", "run")
+    start = time.perf_counter()
+    summary = asyncio.run(extractor2.extract_business_data(corpus, limit=None))
+    stage.add(time.perf_counter() - start, summary["rows"])
+    stages["end_to_end"] = stage
+    stage.extra = {"added": summary["added"], "commits": db.commits, "notifications": messaging.sent}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(result: dict):
+    previous = None
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["rows"] == result["rows"]:
+                    previous = entry
+    if previous is None:
+        print("No previous result with the same number of rows")
+        return
+
+    print(f"Compared with {previous['commit']} ({previous['timestamp']}):")
+    for name, stage in result["stages"].items():
+        before = previous["stages"].get(name, {})
+        if stage.get("rows_per_sec") and before.get("rows_per_sec"):
+            ratio = stage["rows_per_sec"] / before["rows_per_sec"]
+            print(f"  {name:22s} {before['rows_per_sec']:>12} -> {stage['rows_per_sec']:>12} rows/s  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the extraction pipeline.")
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the synthetic corpus (1k to 1M)")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--rtt", type=float, default=0.0, help="simulated Firestore/FCM round trip in seconds")
+    parser.add_argument("--site-latency", type=float, default=0.0, help="simulated fake site latency in seconds")
+    parser.add_argument("--email-sites", type=int, default=500, help="number of websites fetched in the email stage")
+    parser.add_argument("--fuzzy-rows", type=int, default=20000, help="rows sampled for the fuzzy dedupe stage")
+    parser.add_argument("--end-to-end", action="store_true", help="also run extractor2.extract_business_data on stubs")
+    parser.add_argument("--compare", action="store_true", help="compare with the previous stored result")
+    parser.add_argument("--no-save", action="store_true", help="do not append the result to results.jsonl")
+    args = parser.parse_args()
+
+    # Each fake site has its own hostname, so per-domain rate limits apply as in a real run
+    resolve_localhost_names()
+    server = start_fake_sites(port=0, latency=args.site_latency)
+
+    # Caches and snapshots of the run go to a scratch directory
+    workdir = tempfile.mkdtemp(prefix="lp-bench-")
+    os.chdir(workdir)
+    corpus = os.path.join(workdir, "corpus.csv")
+    generate_corpus(corpus, args.rows, site_base_url=site_base_url(server))
+
+    stages = {}
+    chunks = list(bench_csv_and_transform(corpus, args.chunksize, stages))
+    bench_opening_hours(chunks, stages)
+    bench_dedupe(chunks, stages, args.fuzzy_rows)
+    bench_firestore_writes(args.rows, args.rtt, stages)
+    websites = [w for chunk in chunks for w in chunk["Website"] if w][:args.email_sites]
+    bench_email_scan(args.email_sites, stages)
+    bench_email_fetch(websites, stages)
+    if args.end_to_end:
+        bench_end_to_end(corpus, args.rtt, stages)
+    server.shutdown()
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "rows": args.rows,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {},
+    }
+    for name, stage in stages.items():
+        if isinstance(stage, Stage):
+            result["stages"][name] = {**stage.summary(), **getattr(stage, "extra", {})}
+        else:
+            result["stages"][name] = stage
+
+    for name, stage in result["stages"].items():
+        print(f"{name:22s} {json.dumps(stage)}")
+    print(f"peak RSS: {result['peak_rss_mb']} MB")
+
+    if args.compare:
+        compare(result)
+    if not args.no_save:
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
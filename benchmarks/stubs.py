@@ -0,0 +1,135 @@
+import itertools
+import time
+
+SERVER_TIMESTAMP = object()
+
+
+class GeoPoint:
+    def __init__(self, latitude, longitude):
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+class StubDocumentReference:
+    _ids = itertools.count()
+
+    def __init__(self, db, collection_name, doc_id=None):
+        self.db = db
+        self.id = doc_id or f"stub{next(self._ids):016d}"
+        self.path = f"{collection_name}/{self.id}"
+
+    def set(self, data):
+        self.db.commit_writes([(self, data)])
+
+    def update(self, data):
+        self.db.commit_writes([(self, data)])
+
+
+class StubQuery:
+    def __init__(self, docs=()):
+        self._docs = list(docs)
+
+    def select(self, fields):
+        return self
+
+    def where(self, *args, **kwargs):
+        return self
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def stream(self):
+        return iter(self._docs)
+
+    def get(self):
+        return list(self._docs)
+
+
+class StubCollection(StubQuery):
+    def __init__(self, db, name):
+        super().__init__()
+        self.db = db
+        self.name = name
+
+    def document(self, doc_id=None):
+        return StubDocumentReference(self.db, self.name, doc_id)
+
+
+class StubBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, doc_ref, data):
+        self.writes.append((doc_ref, data))
+
+    def update(self, doc_ref, data):
+        self.writes.append((doc_ref, data))
+
+    def commit(self):
+        self.db.commit_writes(self.writes)
+
+
+class StubFirestore:
+    """
+    In-memory stand-in for the Firestore client with a simulated round-trip latency.
+    """
+
+    def __init__(self, rtt: float = 0.0):
+        """
+        :param rtt: Seconds every commit (or single write) takes.
+        """
+        self.rtt = rtt
+        self.commits = 0
+        self.writes = 0
+
+    def collection(self, name):
+        return StubCollection(self, name)
+
+    def batch(self):
+        return StubBatch(self)
+
+    def commit_writes(self, writes):
+        if self.rtt:
+            time.sleep(self.rtt)
+        self.commits += 1
+        self.writes += len(writes)
+
+
+class StubMessaging:
+    """
+    Stand-in for firebase_admin.messaging that counts the messages sent.
+    """
+
+    def __init__(self, rtt: float = 0.0):
+        self.rtt = rtt
+        self.sent = 0
+
+    def Message(self, **kwargs):
+        return kwargs
+
+    def Notification(self, **kwargs):
+        return kwargs
+
+    def send(self, message):
+        if self.rtt:
+            time.sleep(self.rtt)
+        self.sent += 1
+        return f"projects/stub/messages/{self.sent}"
+
+    def send_each(self, messages):
+        if self.rtt:
+            time.sleep(self.rtt)
+        self.sent += len(messages)
+        return StubBatchResponse(len(messages))
+
+
+class StubSendResponse:
+    success = True
+
+
+class StubBatchResponse:
+    def __init__(self, count: int):
+        self.responses = [StubSendResponse()] * count
+        self.success_count = count
+        self.failure_count = 0
@@ -0,0 +1,95 @@
+import argparse
+import csv
+import random
+
+# Same header as the G-Maps Extractor exports we ingest
+COLUMNS = ["Name", "Description", "Fulladdress", "Street", "Municipality", "Categories", "Phone", "Phones",
+           "Claimed", "Review Count", "Average Rating", "Review URL", "Google Maps URL", "Latitude", "Longitude",
+           "Website", "Domain", "Opening Hours", "Featured Image", "Cid", "Place Id", "Kgmid", "Plus code"]
+
+WORDS = ["Golden", "Royal", "Corner", "Happy", "Green", "Silver", "Urban", "Little", "Crown", "Oak", "River", "Bridge"]
+KINDS = ["Cafe", "Kitchen", "Barbers", "Grocers", "Bakery", "Pharmacy", "Restaurant", "Salon", "Bar", "Florist"]
+SUFFIXES = ["", "", "", " Ltd", " Ltd.", " & Co", " London"]
+STREETS = ["High Street", "Church Road", "Station Road", "Mare Street", "Leyton High Road", "Roman Road"]
+AREAS = ["E1", "E2", "E5", "E8", "E9", "E10", "E11", "E15", "E17", "E20", "N1", "N16", "SE1", "SW9"]
+HOURS = ["10 am-8:30 pm", "9 am-5 pm", "11 am-11 pm", "7:30 am-6 pm", "12 pm-10 pm", "8 am-8 pm"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _opening_hours(rng: random.Random) -> str:
+    if rng.random() < 0.1:
+        return ""
+    # Most businesses share one of a few weekly patterns, like real exports
+    pattern = rng.randrange(12)
+    local = random.Random(pattern)
+    days = [day for day in DAYS if local.random() > 0.15]
+    return ", ".join(f"{day}: [{local.choice(HOURS).replace(' ', chr(0x202f), 1)}]" for day in days)
+
+
+def synthetic_row(index: int, rng: random.Random, site_base_url: str) -> dict:
+    name = f"{rng.choice(WORDS)} {rng.choice(KINDS)}{rng.choice(SUFFIXES)}"
+    if rng.random() < 0.7:
+        name = f"{name} {index}"
+    area = rng.choice(AREAS)
+    postcode = f"{area} {rng.randint(1, 9)}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}"
+    street = f"{rng.randint(1, 400)} {rng.choice(STREETS)}"
+    phone = f"+44 20 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}"
+    place_id = "ChIJ" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-") for _ in range(23))
+    size = rng.choice([80, 92, 100, 120])
+    image = f"https://lh5.googleusercontent.com/p/AF1Qip{index}=w{size}-h{size + 12}-k-no" if rng.random() < 0.8 else \
+        f"https://streetviewpixels-pa.googleapis.com/v1/thumbnail?panoid={index}&w={size}&h={size}"
+    has_website = rng.random() < 0.6
+
+    return {
+        "Name": name,
+        "Description": "" if rng.random() < 0.5 else f"Family run {name.lower()} serving the neighbourhood.",
+        "Fulladdress": f"{street}, London {postcode}",
+        "Street": street,
+        "Municipality": "London",
+        "Categories": rng.choice(KINDS),
+        "Phone": phone,
+        "Phones": phone if rng.random() < 0.7 else f"{phone}, +44 7{rng.randint(100000000, 999999999)}",
+        "Claimed": rng.choice(["YES", "NO"]),
+        "Review Count": rng.randint(0, 2000),
+        "Average Rating": round(rng.uniform(2.5, 5), 1),
+        "Review URL": "",
+        "Google Maps URL": f"https://www.google.com/maps/place/?q=place_id:{place_id}",
+        "Latitude": "" if rng.random() < 0.005 else round(51.5 + rng.uniform(-0.1, 0.1), 7),
+        "Longitude": round(-0.05 + rng.uniform(-0.15, 0.15), 7),
+        "Website": f"{site_base_url.format(index=index)}/site/{index}" if has_website else "",
+        "Domain": "",
+        "Opening Hours": _opening_hours(rng),
+        "Featured Image": image,
+        "Cid": rng.randint(10 ** 18, 10 ** 19),
+        "Place Id": place_id,
+        "Kgmid": f"/g/{index:011x}",
+        "Plus code": "",
+    }
+
+
+def generate_corpus(output_csv: str, rows: int, seed: int = 42, site_base_url: str = "http://127.0.0.1:8765"):
+    """
+    Writes a synthetic G-Maps Extractor CSV.
+
+    :param output_csv: Path of the CSV to write.
+    :param rows: Number of businesses.
+    :param seed: Random seed, the same seed always produces the same file.
+    :param site_base_url: Base URL of the fake business sites (see fake_sites.py), "{index}"
+                          is replaced by the row number, e.g. "http://business{index}.localhost:8765".
+    """
+    rng = random.Random(seed)
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for index in range(rows):
+            writer.writerow(synthetic_row(index, rng, site_base_url))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic G-Maps Extractor CSV.")
+    parser.add_argument("output_csv")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--site-base-url", default="http://127.0.0.1:8765")
+    args = parser.parse_args()
+    generate_corpus(args.output_csv, args.rows, args.seed, args.site_base_url)
@@ -0,0 +1,98 @@
+import json
+import os
+
+# Stages recorded for every row of an input file, in pipeline order
+STAGE_WEBSITE = "website"
+STAGE_EMAIL = "email"
+STAGE_WRITTEN = "written"
+
+
+def default_journal_path(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + ".journal.jsonl"
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the stages completed for each row of one input file.
+
+    Every completed stage is appended as one JSON line keyed by Place ID, so a
+    crash loses at most the line being written (a truncated last line is
+    ignored on load). Opening the journal compacts it to one line per Place ID.
+
+        journal = CheckpointJournal("E20.journal.jsonl")
+        journal.record(place_id, STAGE_WEBSITE, website)
+        if journal.done(place_id, STAGE_WRITTEN):
+            ...
+    """
+
+    def __init__(self, path: str, reset: bool = False):
+        """
+        :param path: Path of the journal file.
+        :param reset: Discard the journal of a previous run instead of resuming from it.
+        """
+        self.path = path
+        self.entries = {}
+        self.resumed = 0
+        if reset and os.path.exists(path):
+            os.remove(path)
+        self._load()
+        self.compact()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Line cut short by a crash, the stage is simply redone
+                    continue
+                stages = self.entries.setdefault(entry["key"], {})
+                if "stages" in entry:
+                    stages.update(entry["stages"])
+                else:
+                    stages[entry["stage"]] = entry["output"]
+
+    def compact(self):
+        """
+        Rewrites the journal with one line per Place ID.
+        """
+        if not self.entries:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, stages in self.entries.items():
+                f.write(json.dumps({"key": key, "stages": stages}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def done(self, key: str, stage: str) -> bool:
+        return stage in self.entries.get(key, ())
+
+    def get(self, key: str, stage: str, default=None):
+        """
+        :return: The output recorded for the stage, or `default` if it has not completed.
+        """
+        return self.entries.get(key, {}).get(stage, default)
+
+    def record(self, key: str, stage: str, output=None):
+        """
+        Appends a completed stage and its output (must be JSON serializable).
+        """
+        self.entries.setdefault(key, {})[stage] = output
+        self._file.write(json.dumps({"key": key, "stage": stage, "output": output}) + "\n")
+        self._file.flush()
+
+    def sync(self):
+        """
+        Forces the appended lines to disk, called once the matching writes are committed.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+        self.compact()
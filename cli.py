@@ -0,0 +1,148 @@
+"""
+Single entry point for the extraction tools.
+
+    python cli.py csv-json export.csv businesses.json
+    python cli.py csv-json export.csv businesses.jsonl.gz
+    python cli.py ingest E20.csv --limit 0 --resume
+    python cli.py ingest a.csv b.csv --workers 8 --by postcode
+    python cli.py emails export.csv businesses_with_emails.csv
+    python cli.py resolve ChIJ6agvSFUbdkgR3PO7Wiq5wyA
+    python cli.py export-names --output names.bin
+    python cli.py backfill --dry-run
+
+Every subcommand imports what it needs when it runs, so `csv-json` never
+loads Selenium or the Firebase SDK, and Firebase is initialized once through
+firebase_app.
+"""
+import argparse
+import os
+import sys
+
+from name_export import DEFAULT_PARTITIONS
+
+
+def cmd_csv_json(args):
+    from main import extract_business_data
+
+    extract_business_data(args.file, args.output, **chunk_option(args))
+
+
+def cmd_ingest(args):
+    if args.workers == 1 and len(args.files) == 1:
+        import asyncio
+        from extractor2 import extract_business_data
+
+        asyncio.run(extract_business_data(args.files[0], limit=args.limit or None, resume=args.resume,
+                                          notification_mode=args.notifications, profile=args.profile, fuzzy=args.fuzzy,
+                                          **chunk_option(args)))
+        return
+
+    from sharded_ingest import run_sharded
+
+    run_sharded(args.files, args.workers, args.by, args.limit or None, notification_mode=args.notifications,
+                resume=args.resume, fuzzy=args.fuzzy, **chunk_option(args))
+
+
+def cmd_emails(args):
+    from new2 import process_csv
+
+    process_csv(args.file, args.output, **chunk_option(args))
+
+
+def cmd_resolve(args):
+    from place_cache import STATUS_ERROR, get_place_cache
+    from place_resolver import get_place_resolver
+    from rate_control import call_with_retry
+
+    resolver = get_place_resolver()
+    resolver.browser = not args.no_browser
+    lookup = lambda place_id: call_with_retry(resolver.lookup, place_id, retry_if=lambda result: result[1] == STATUS_ERROR)
+
+    for place_id in args.place_ids:
+        website = get_place_cache().resolve(place_id, lookup) if args.cache else lookup(place_id)[0]
+        print(f"{place_id}\t{website or ''}")
+    print("Place ID tiers:", resolver.summary(), file=sys.stderr)
+
+
+def cmd_export_names(args):
+    from get_business_names import save_names_from_firestore
+
+    save_names_from_firestore(args.collection, args.output, args.partitions)
+
+
+def cmd_backfill(args):
+    from backfill import backfill_vendor_images
+    from firebase_app import get_db
+
+    options = {name: value for name, value in (("width", args.width), ("workers", args.workers)) if value}
+    backfill_vendor_images(get_db(), dry_run=args.dry_run, resume=args.resume, **options)
+
+
+def chunk_option(args) -> dict:
+    # csv_stream (and pandas) is not imported just for its default chunk size
+    return {"chunksize": args.chunksize} if args.chunksize else {}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Extract, enrich and upload G-Maps business exports.")
+    parser.add_argument("--credentials", help="Firebase service account key (default: credentials_prod.json)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    csv_json = subparsers.add_parser("csv-json", help="convert a G-Maps export to JSON (no Firebase, no browser)")
+    csv_json.add_argument("file", help="CSV export")
+    csv_json.add_argument("output", nargs="?", default="businesses.json", help="output file, .json/.jsonl/.csv/.parquet (text formats may end in .gz/.bz2/.xz)")
+    csv_json.add_argument("--chunksize", type=int, help="rows read at a time")
+    csv_json.set_defaults(handler=cmd_csv_json)
+
+    ingest = subparsers.add_parser("ingest", help="upload the new vendors of G-Maps exports to Firestore")
+    ingest.add_argument("files", nargs="+", help="CSV exports to ingest")
+    ingest.add_argument("--limit", type=int, default=10, help="maximum number of vendors to add, per shard when sharded (0 for no limit)")
+    ingest.add_argument("--resume", action="store_true", help="skip the work a previous run completed")
+    ingest.add_argument("--chunksize", type=int, help="rows read at a time")
+    ingest.add_argument("--notifications", choices=["each", "digest"], default="each", help="one notification per vendor or a digest per area")
+    ingest.add_argument("--fuzzy", action="store_true", help="also report possible duplicates with similar names")
+    ingest.add_argument("--profile", action="store_true", help="save a cProfile capture next to the run report (single process only)")
+    ingest.add_argument("--workers", type=int, default=1, help="worker processes, more than one (or several files) runs sharded")
+    ingest.add_argument("--by", choices=["name", "postcode", "rows"], default="name", help="how rows are partitioned when sharded")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    emails = subparsers.add_parser("emails", help="add the emails of each business website to a G-Maps export")
+    emails.add_argument("file", help="CSV export with a 'Place Id' column")
+    emails.add_argument("output", nargs="?", default="businesses_with_emails.csv", help="output file, .csv/.jsonl/.json/.parquet (text formats may end in .gz/.bz2/.xz)")
+    emails.add_argument("--chunksize", type=int, help="rows read at a time")
+    emails.set_defaults(handler=cmd_emails)
+
+    resolve = subparsers.add_parser("resolve", help="print the website of Google Place IDs")
+    resolve.add_argument("place_ids", nargs="+", help="Google Place IDs")
+    resolve.add_argument("--no-browser", action="store_true", help="only use the HTTP tier, never start Chrome")
+    resolve.add_argument("--no-cache", dest="cache", action="store_false", help="bypass the local place cache")
+    resolve.set_defaults(handler=cmd_resolve)
+
+    export_names = subparsers.add_parser("export-names", help="export the vendor names used for duplicate checks")
+    export_names.add_argument("--collection", default="vendors", help="Firestore collection")
+    export_names.add_argument("--output", default="names.json", help="names.json, or .jsonl/.bin for the streaming export")
+    export_names.add_argument("--partitions", type=int, default=DEFAULT_PARTITIONS, help="partitions scanned in parallel by the streaming export")
+    export_names.set_defaults(handler=cmd_export_names)
+
+    backfill = subparsers.add_parser("backfill", help="resize the images of all extracted vendors")
+    backfill.add_argument("--width", type=int, help="target image width in pixels (default: 560)")
+    backfill.add_argument("--workers", type=int, help="batches committed in parallel (default: 8)")
+    backfill.add_argument("--dry-run", action="store_true", help="only report what would change")
+    backfill.add_argument("--resume", action="store_true", help="continue after the last committed page")
+    backfill.set_defaults(handler=cmd_backfill)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.credentials:
+        # Read by firebase_app, in this process and in spawned shard workers
+        from firebase_app import CREDENTIALS_ENV
+
+        os.environ[CREDENTIALS_ENV] = args.credentials
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
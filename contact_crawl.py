@@ -0,0 +1,134 @@
+import heapq
+import re
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from rate_control import url_domain
+
+DEFAULT_MAX_PAGES = 4
+DEFAULT_MAX_BYTES = 1024 * 1024  # 1 MB per site
+
+HREF_PATTERN = re.compile(r"""href\s*=\s*["']([^"'#\s]+)""", re.IGNORECASE)
+
+# Path keywords of the pages small businesses put their email on, best first
+CONTACT_HINTS = (
+    ("contact", 10),
+    ("get-in-touch", 9),
+    ("enquir", 8),
+    ("booking", 6),
+    ("about", 5),
+    ("find-us", 5),
+    ("visit", 4),
+    ("team", 3),
+    ("info", 2),
+)
+
+SKIPPED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".pdf", ".css", ".js", ".ico", ".zip", ".mp4")
+
+
+def score_link(url: str) -> int:
+    """
+    Scores how likely a link leads to contact details, 0 for links not worth a fetch.
+    """
+    path = urlsplit(url).path.lower()
+    if path.endswith(SKIPPED_EXTENSIONS):
+        return 0
+    return max((score for hint, score in CONTACT_HINTS if hint in path), default=0)
+
+
+class ContactFrontier:
+    """
+    Decides which pages of one website to fetch while looking for an email.
+
+    Starts with the home page, then follows same-domain links in order of
+    `score_link` (contact pages first). Stops as soon as a page yields an email
+    or when the page or byte budget is spent. The frontier does no I/O, see
+    `crawl_contacts` and `crawl_contacts_async` for the fetch loops.
+    """
+
+    def __init__(self, home_url: str, scan, max_pages: int = DEFAULT_MAX_PAGES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param home_url: The website of the business, with its scheme.
+        :param scan: Function returning (email, additional emails) for a page's HTML.
+        :param max_pages: Maximum number of pages fetched, home page included.
+        :param max_bytes: Maximum number of characters downloaded.
+        """
+        self.home = home_url
+        self.scan = scan
+        self.domain = url_domain(self.home)
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.pages = 0
+        self.bytes = 0
+        self.result = (None, None)
+        self._seen = {self.home}
+        self._heap = [(0, 0, self.home)]
+        self._order = 1
+
+    def next_url(self):
+        """
+        :return: The next URL to fetch, or None when the crawl is over.
+        """
+        if self.result[0] or not self._heap or self.pages >= self.max_pages or self.bytes >= self.max_bytes:
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def add_page(self, url: str, html: str):
+        """
+        Scans a fetched page for emails and queues its contact-like links.
+
+        :param url: The URL the page was fetched from.
+        :param html: The page HTML, or None if the fetch failed.
+        """
+        self.pages += 1
+        if html is None:
+            return
+        self.bytes += len(html)
+
+        email, additional = self.scan(html)
+        if email:
+            self.result = (email, additional)
+            return
+
+        for href in HREF_PATTERN.findall(html):
+            link = urldefrag(urljoin(url, href))[0]
+            if link in self._seen or not link.startswith("http") or url_domain(link) != self.domain:
+                continue
+            self._seen.add(link)
+            score = score_link(link)
+            if score:
+                heapq.heappush(self._heap, (-score, self._order, link))
+                self._order += 1
+
+
+def crawl_contacts(fetch, scan, home_url: str, max_pages: int = DEFAULT_MAX_PAGES, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Looks for an email on a website with a blocking `fetch(url) -> str` function.
+
+    :param fetch: Function downloading a page.
+    :param scan: Function returning (email, additional emails) for a page's HTML.
+    :param home_url: The website of the business, with its scheme.
+    :return: Tuple of (first email, comma separated additional emails), or (None, None).
+    """
+    frontier = ContactFrontier(home_url, scan, max_pages, max_bytes)
+    url = frontier.next_url()
+    while url:
+        try:
+            html = fetch(url)
+        except Exception as e:
+            print(f"Error fetching email from website {url}: {e}")
+            html = None
+        frontier.add_page(url, html)
+        url = frontier.next_url()
+    return frontier.result
+
+
+async def crawl_contacts_async(fetch, scan, home_url: str, max_pages: int = DEFAULT_MAX_PAGES, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Same as `crawl_contacts` with an async `fetch(url) -> str | None` function.
+    """
+    frontier = ContactFrontier(home_url, scan, max_pages, max_bytes)
+    url = frontier.next_url()
+    while url:
+        frontier.add_page(url, await fetch(url))
+        url = frontier.next_url()
+    return frontier.result
@@ -0,0 +1,41 @@
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def read_csv_header(file_path: str) -> list:
+    """
+    :param file_path: Path of the CSV file.
+    :return: List of column names, without reading any rows.
+    """
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def iter_csv_chunks(file_path: str, columns: list = None, chunksize: int = DEFAULT_CHUNK_SIZE, required: bool = False, fillna: bool = True):
+    """
+    Reads a G-Maps export in chunks so memory stays flat regardless of file size.
+
+    Only `columns` are parsed. Columns missing from the file are added as empty
+    strings, unless `required` is set in which case a ValueError is raised.
+
+    :param file_path: Path of the CSV file.
+    :param columns: Columns to read, or None for every column.
+    :param chunksize: Number of rows per chunk.
+    :param required: Raise instead of adding missing columns.
+    :param fillna: Replace missing values with empty strings.
+    :return: Generator of DataFrames with exactly `columns`, in that order.
+    """
+    header = read_csv_header(file_path)
+    if columns is None:
+        columns = header
+
+    missing_columns = [col for col in columns if col not in header]
+    if missing_columns and required:
+        raise ValueError(f"Missing required columns: {set(missing_columns)}")
+
+    usecols = [col for col in columns if col in header]
+    for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+        for col in missing_columns:
+            chunk[col] = ""
+        chunk = chunk[columns]
+        yield chunk.fillna("") if fillna else chunk
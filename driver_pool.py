@@ -0,0 +1,139 @@
+import atexit
+import contextlib
+import functools
+import threading
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_driver_path() -> str:
+    """
+    Resolves the chromedriver binary once per process.
+
+    :return: Path to the chromedriver executable.
+    """
+    return ChromeDriverManager().install()
+
+
+# Function to set up Selenium WebDriver
+def setup_driver():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run in headless mode
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps up to `size` headless Chrome sessions warm and hands them out to callers.
+
+    A browser is recycled after `max_pages` page loads, or straight away when it
+    raises a WebDriverException (crashed tab, dead session, ...).
+    """
+
+    def __init__(self, size: int = 1, max_pages: int = 100):
+        """
+        :param size: Maximum number of browsers alive at the same time.
+        :param max_pages: Number of pages a browser serves before it is restarted.
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = []
+        self._pages = {}
+        # Guards the idle list, page counts and counters, waiters are woken on release or discard
+        self._cond = threading.Condition()
+        self._alive = 0
+        self.started = 0
+        self.recycled = 0
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._alive >= self.size:
+                # Every browser is busy, wait for one to be released (or discarded, then start a new one)
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._alive += 1
+
+        try:
+            driver = setup_driver()
+        except Exception:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.started += 1
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._cond:
+            self._pages.pop(id(driver), None)
+            self._alive -= 1
+            self.recycled += 1
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def _release(self, driver):
+        with self._cond:
+            self._pages[id(driver)] += 1
+            expired = self._pages[id(driver)] >= self.max_pages
+            if not expired:
+                self._idle.append(driver)
+                self._cond.notify()
+        if expired:
+            self._discard(driver)
+
+    @contextlib.contextmanager
+    def driver(self):
+        """
+        Borrows a browser from the pool for the duration of the `with` block.
+        """
+        driver = self._acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            # The session is likely broken, never hand it out again
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._release(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def close(self):
+        """
+        Quits every idle browser in the pool.
+        """
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+
+@functools.lru_cache(maxsize=None)
+def get_driver_pool(size: int = 1, max_pages: int = 100) -> DriverPool:
+    """
+    Returns the process-wide driver pool, creating it on first use.
+
+    :param size: Maximum number of browsers alive at the same time.
+    :param max_pages: Number of pages a browser serves before it is restarted.
+    :return: The shared DriverPool.
+    """
+    pool = DriverPool(size=size, max_pages=max_pages)
+    atexit.register(pool.close)
+    return pool
@@ -0,0 +1,151 @@
+import asyncio
+from urllib.parse import urlsplit
+import aiohttp
+from email_scanner import MAX_PAGE_BYTES, emails_from_page, read_capped_async
+from contact_crawl import DEFAULT_MAX_BYTES, DEFAULT_MAX_PAGES, crawl_contacts_async
+from http_cache import ResponseCache, get_response_cache
+from rate_control import OUTCOME_THROTTLED, THROTTLE_STATUSES, RateController, backoff_delay, get_rate_controller, retry_after_seconds
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_PER_HOST = 2
+DEFAULT_TIMEOUT = 10
+DEFAULT_ATTEMPTS = 3
+
+
+def normalize_website_url(website_url: str) -> str:
+    """
+    Adds a scheme to bare website values such as "example.co.uk".
+
+    :param website_url: The website as found in the CSV or on Google Maps.
+    :return: The URL with an http(s) scheme.
+    """
+    if not website_url.startswith("http"):
+        website_url = "http://" + website_url
+    return website_url
+
+
+def emails_from_html(html: str):
+    """
+    Finds email addresses in an HTML page, see email_scanner.scan_emails.
+
+    :param html: The page HTML.
+    :return: Tuple of (first email in page order, comma separated additional emails), or (None, None).
+    """
+    return emails_from_page(html)
+
+
+class AsyncEmailHarvester:
+    """
+    Fetches many websites concurrently with a global and a per-host concurrency limit.
+
+    Within those limits each domain is paced by its adaptive limiter, and
+    throttled or failed requests are retried after a jittered backoff. When the
+    home page has no email, contact-like pages of the same site are crawled
+    within a per-site page and byte budget.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST, timeout: float = DEFAULT_TIMEOUT,
+                 cache: ResponseCache = None, rate_controller: RateController = None, attempts: int = DEFAULT_ATTEMPTS,
+                 max_pages: int = DEFAULT_MAX_PAGES, max_bytes: int = DEFAULT_MAX_BYTES, max_page_bytes: int = MAX_PAGE_BYTES):
+        """
+        :param max_concurrency: Maximum number of requests in flight overall.
+        :param per_host: Maximum number of requests in flight to a single host.
+        :param timeout: Total timeout of a single request in seconds.
+        :param cache: ResponseCache consulted before fetching (defaults to the shared one).
+        :param rate_controller: RateController pacing each domain (defaults to the shared one).
+        :param attempts: Maximum number of requests per URL.
+        :param max_pages: Maximum number of pages fetched per website (1 for the home page only).
+        :param max_bytes: Maximum number of characters downloaded per website.
+        :param max_page_bytes: Each response body is cut off after this many bytes.
+        """
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache or get_response_cache()
+        self.rate_controller = rate_controller or get_rate_controller()
+        self.attempts = attempts
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_page_bytes = max_page_bytes
+        self._global = None
+        self._hosts = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def fetch_text(self, session: aiohttp.ClientSession, url: str):
+        """
+        Downloads a page while respecting both concurrency limits.
+
+        :param session: The shared aiohttp session.
+        :param url: The URL to fetch.
+        :return: The response body, or None on failure.
+        """
+        entry = self.cache.get(url)
+        if entry and self.cache.is_fresh(entry):
+            return entry["body"]
+
+        limiter = self.rate_controller.for_url(url)
+        for attempt in range(self.attempts):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            try:
+                # Host first, so URLs waiting on a busy host do not hold global slots. The
+                # limiter slot is innermost so it times the request, not our own queue
+                async with self._host_semaphore(url), self._global, limiter.async_slot() as slot:
+                    async with session.get(url, headers=self.cache.validators(entry)) as response:
+                        if response.status in THROTTLE_STATUSES:
+                            slot.mark(OUTCOME_THROTTLED, retry_after_seconds(response.headers))
+                            continue
+
+                        if response.status == 304 and entry:
+                            self.cache.refresh(url, entry)
+                            return entry["body"]
+
+                        text = await read_capped_async(response, self.max_page_bytes)
+                        if response.status == 200:
+                            self.cache.put(url, text, response.headers)
+                        return text
+            except Exception as e:
+                print(f"Error fetching email from website {url}: {e}")
+
+        return None
+
+    async def _harvest_one(self, session, website: str):
+        fetch = lambda url: self.fetch_text(session, url)
+        return await crawl_contacts_async(fetch, emails_from_html, normalize_website_url(website), self.max_pages, self.max_bytes)
+
+    async def harvest(self, websites):
+        """
+        Extracts emails from every website concurrently.
+
+        :param websites: Iterable of website URLs (duplicates are fetched once).
+        :return: Dictionary of website -> (email, additional emails).
+        """
+        unique_websites = list(dict.fromkeys(w for w in websites if w))
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._hosts = {}
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            results = await asyncio.gather(*(self._harvest_one(session, w) for w in unique_websites))
+
+        return dict(zip(unique_websites, results))
+
+
+async def harvest_emails(websites, max_concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Convenience wrapper around AsyncEmailHarvester.harvest.
+
+    :param websites: Iterable of website URLs.
+    :param max_concurrency: Maximum number of requests in flight overall.
+    :param per_host: Maximum number of requests in flight to a single host.
+    :param timeout: Total timeout of a single request in seconds.
+    :return: Dictionary of website -> (email, additional emails).
+    """
+    harvester = AsyncEmailHarvester(max_concurrency, per_host, timeout)
+    return await harvester.harvest(websites)
@@ -0,0 +1,101 @@
+import re
+
+# Pages are cut off here, contact details sit well within the first few hundred kB
+MAX_PAGE_BYTES = 512 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+# The lookbehind makes every run of local-part characters start a single match
+# attempt, so long base64 blobs and minified scripts are scanned in linear time
+EMAIL_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9._%+-])([A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63})*\.[A-Za-z]{2,24})"
+)
+
+# "logo@2x.png" and friends match the address pattern but are file names
+FILE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "svg", "webp", "avif", "ico", "bmp", "css", "js", "json", "map", "pdf", "mp4", "woff", "woff2"}
+
+# Placeholder and error-reporting addresses found in themes and page builders
+IGNORED_DOMAINS = ("example.com", "example.org", "domain.com", "yourdomain.com", "email.com", "sentry.io", "wixpress.com", "sentry-next.wixpress.com")
+
+
+def is_plausible_email(email: str) -> bool:
+    domain = email.rsplit("@", 1)[1]
+    if domain.rsplit(".", 1)[1] in FILE_EXTENSIONS:
+        return False
+    if domain.endswith(IGNORED_DOMAINS):
+        return False
+    # Local parts like "-abc" or "foo." come from URLs and minified code
+    return email[0] not in ".-" and "." != email.split("@", 1)[0][-1]
+
+
+def scan_emails(page: str) -> list:
+    """
+    Finds the email addresses of a page in one pass over its raw HTML.
+
+    Both `mailto:` links and plain-text addresses match, duplicates are dropped
+    case-insensitively and the addresses keep the order they appear in.
+
+    :param page: The page HTML (or any text).
+    :return: List of email addresses in discovery order.
+    """
+    found = {}
+    for match in EMAIL_PATTERN.finditer(page):
+        email = match.group(1).rstrip(".")
+        key = email.lower()
+        if key not in found and is_plausible_email(key):
+            found[key] = email
+    return list(found.values())
+
+
+def emails_from_page(page: str):
+    """
+    :param page: The page HTML.
+    :return: Tuple of (first email, comma separated additional emails), or (None, None).
+    """
+    emails = scan_emails(page)
+    if emails:
+        return emails[0], ", ".join(emails[1:])
+    return None, None
+
+
+def decode_body(body: bytes, encoding: str = None) -> str:
+    try:
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset in the Content-Type header
+        return body.decode("utf-8", errors="replace")
+
+
+def read_capped(response, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    """
+    Reads at most `max_bytes` of a streamed requests response (`stream=True`) and closes it.
+
+    :return: The decoded body.
+    """
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(READ_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+    finally:
+        response.close()
+    return decode_body(b"".join(chunks)[:max_bytes], response.encoding)
+
+
+async def read_capped_async(response, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    """
+    Reads at most `max_bytes` of an aiohttp response.
+
+    :return: The decoded body.
+    """
+    chunks = []
+    size = 0
+    while size < max_bytes:
+        chunk = await response.content.read(min(READ_CHUNK_SIZE, max_bytes - size))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    return decode_body(b"".join(chunks), response.charset)
@@ -1,99 +1,62 @@
 import pandas as pd
-import json
-import firebase_admin
-from firebase_admin import messaging, credentials, firestore
-import re
-import datetime
-
-def extract_business_data(file_path, output_json):
+from firebase_admin import messaging, firestore
+import functools
+from csv_stream import DEFAULT_CHUNK_SIZE, iter_csv_chunks
+from firebase_app import get_db
+from firestore_batch import BatchWriter
+from opening_hours import compile_opening_hours, opening_hours_cache_info
+from transform import HOURS_KEY_COLUMN, LAT_COLUMN, LON_COLUMN, transform_chunk
+from vendor_index import VendorIndex
+from vendor_record import VendorRecord
+
+def extract_business_data(file_path, output_json, chunksize=DEFAULT_CHUNK_SIZE):
     """Extracts business details from CSV, formats, uploads to Firebase, and saves JSON."""
-    # Load CSV file
-    df = pd.read_csv(file_path)
-    
     # Select required columns
     selected_columns = ["Name", "Description", "Fulladdress", "Phone", "Phones", "Featured Image", "Latitude", "Longitude", "Street", "Website", "Place Id", "Opening Hours"]
     
-    # Fill missing columns with empty string
-    for col in selected_columns:
-        if col not in df.columns:
-            df[col] = ""
-    
-    df_selected = df[selected_columns].fillna("")
-    
-    # Process 'Phones' column to extract the first phone number and trim whitespace
-    df_selected["Phones"] = df_selected["Phones"].astype(str).apply(lambda x: x.split(",")[0].replace(" ", "") if pd.notna(x) else "")
-    
-    # Process 'Phone' column to trim whitespace
-    df_selected["Phone"] = df_selected["Phone"].astype(str).apply(lambda x: x.replace(" ", ""))
-    
     # Initialize Firebase
-    cred = credentials.Certificate("credentials_prod.json")
-    firebase_admin.initialize_app(cred)
-    db = firestore.client()
+    db = get_db()
+    writer = BatchWriter(db)
     
     business_list = []
     
     postcode_pattern = r"E\d{2} \w{3}"
 
-    for _, row in df_selected.iterrows():
-        postcode_match = re.search(postcode_pattern, row["Fulladdress"])
-        # Extracted postcode
-        postcode = postcode_match.group() if postcode_match else None
-        doc_ref = db.collection("vendors").document()
-        doc_id = doc_ref.id
-        openingHoursRow = convert_hours_string_to_dict(row["Opening Hours"])
-        openingHours = parse_opening_hours(openingHoursRow)
-        print(openingHoursRow)
-        print(openingHours)
-        hdImageUrl = resize_google_image_url(row["Featured Image"])
-        business_data = {
-            "active": True,
-            "address": row["Fulladdress"],
-            "category": "Other",
-            "city": "London",
-            "contact": row["Phones"],
-            "country": "United Kingdom",
-            "description": row["Description"],
-            "dynamicLink": "",
-            "email": "",
-            "endTime": firestore.SERVER_TIMESTAMP,
-            "images": hdImageUrl,
-            "isVerified": True,
-            "latitude": row["Latitude"],
-            "line1": row["Street"],
-            "location": firestore.GeoPoint(float(row["Latitude"]), float(row["Longitude"])),
-            "longitude": row["Longitude"],
-            "name": row["Name"],
-            "openingHours": openingHours,
-            "ownerId": doc_id,
-            "phone": row["Phone"],
-            "pincode": postcode,
-            "qrCode": "",
-            "rating": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0, "count": 0, "rating": 0},
-            "ratings": [],
-            "socialLinks": {"facebookId": "", "instaId": ""},
-            "startTime": firestore.SERVER_TIMESTAMP,
-            "state": "NA",
-            "uid": doc_id,
-            "website": row["Website"],
-            "extracted": True,
-            "claimed": False,
-            "google_place_id": row["Place Id"],
-            "workingDays": {day: True for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
-        }
+    # Load CSV file one chunk at a time, missing columns are filled with empty strings
+    for df_selected in iter_csv_chunks(file_path, selected_columns, chunksize):
+        # Derived columns (phones, postcode, image, hours key, coordinates) for the whole chunk
+        df_selected = transform_chunk(df_selected, postcode_pattern, query_pattern=False)
+
+        for row in df_selected.to_dict(orient="records"):
+            if pd.isna(row[LAT_COLUMN]) or pd.isna(row[LON_COLUMN]):
+                print("Invalid coordinates, skipping: " + row["Name"])
+                continue
+            doc_ref = db.collection("vendors").document()
+            doc_id = doc_ref.id
+            # Each distinct hours string is parsed once
+            openingHours = compile_opening_hours(row[HOURS_KEY_COLUMN])
+            print(row[HOURS_KEY_COLUMN])
+            print(openingHours)
+            # Only the variable fields are set per row, the rest comes from a shared template
+            business_data = VendorRecord.from_row(row, openingHours, category="Other").to_firestore(doc_id, firestore)
         
-        # Upload to Firebase
-        #doc_ref = db.collection("TempBusinesses").add(business_data)
-        #business_data["ownerId"] = doc_ref[1].id
-        #business_data["uid"] = doc_ref[1].id
+            # Upload to Firebase
+            #doc_ref = db.collection("TempBusinesses").add(business_data)
+            #business_data["ownerId"] = doc_ref[1].id
+            #business_data["uid"] = doc_ref[1].id
         
-        isVendorExists = is_name_in_list(row["Name"])
-        if isVendorExists:
-            print("Already exists: " + row["Name"])
-        else:
-            doc_ref.set(business_data)
-            #send_shop_onboard_notification(row["Fulladdress"], row["Name"], doc_id)
-        #business_list.append(business_data)
+            isVendorExists = is_name_in_list(row["Name"])
+            if isVendorExists:
+                print("Already exists: " + row["Name"])
+            else:
+                writer.set(doc_ref, business_data)
+                #send_shop_onboard_notification(row["Fulladdress"], row["Name"], doc_id)
+            #business_list.append(business_data)
+
+    # Commit whatever is left in the last batch
+    writer.flush()
+    print("== Batched writes ==", writer.summary())
+    print("== Opening hours cache ==", opening_hours_cache_info())
     
     # Save to JSON
     #with open(output_json, "w", encoding="utf-8") as f:
@@ -144,146 +107,36 @@ def is_name_in_list(name: str, filename: str = "names.json") -> bool:
     """
     Checks if a given name exists in the JSON file containing a list of names.
 
+    The file is loaded once into a VendorIndex, names are compared on their
+    normalized key (case, punctuation and "Ltd" are ignored).
+
     :param name: The name to check.
     :param filename: The JSON file where the list is stored.
     :return: True if the name exists, otherwise False.
     """
-    try:
-        # Load the JSON file
-        with open(filename, "r") as json_file:
-            names = json.load(json_file)
-
-        # Check if the name is in the list
-        return name in names
-
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading file: {e}")
-        return False
-    
-
-def parse_opening_hours(row: dict):
-    """
-    Converts CSV row opening hours into Firestore openingHours format.
-
-    :param row: Dictionary containing days as keys and their opening hours as values.
-    :return: Dictionary formatted for Firestore.
-    """
-
-    # Default hours for days that might be missing
-    default_hours = {
-        "Monday": "10 am-8:30 pm",
-        "Tuesday": "10 am-8:30 pm",
-        "Wednesday": "10 am-8:30 pm",
-        "Thursday": "10 am-8:30 pm",
-        "Friday": "10 am-8:30 pm",
-        "Saturday": "10 am-8:30 pm",
-        "Sunday": "10 am-8 pm"
-    }
-
-    # Get the current date to construct timestamps
-    today = datetime.date.today()
+    index = load_name_index(filename)
+    return index is not None and name in index
 
-    opening_hours = {}
 
-    for day in default_hours.keys():
-        # Check if the day is present in the row; if not, mark it as closed
-        if day in row:
-            hours = row[day]
-            is_open = True
-        else:
-            hours = default_hours[day]  # Use default hours
-            is_open = False  # Mark as closed
-
-        # Extract start and end time
-        start_time, end_time = hours.split("-")
-
-        # Define time format dynamically based on presence of minutes
-        today = datetime.date.today()
-        start_datetime = convert_to_utc_datetime(today, start_time)
-        end_datetime = convert_to_utc_datetime(today, end_time)
-
-        # Add Firestore timestamps
-        opening_hours[day] = {
-            "startTime": start_datetime,  # Firestore Timestamp with given datetime
-            "endTime": end_datetime,  # Firestore Timestamp with given datetime
-            "isOpen": is_open
-        }
-
-    return opening_hours
-
-def convert_to_utc_datetime(date: datetime.date, time_str: str):
+@functools.lru_cache(maxsize=None)
+def load_name_index(filename: str = "names.json"):
     """
-    Converts a given time string into a Firestore-compatible UTC datetime.
-
-    Assumes the input time is already in UTC.
+    Loads the list of names into a VendorIndex once per file.
 
-    :param date: The date to use (typically today’s date).
-    :param time_str: The time string (e.g., "11 am" or "8:30 pm").
-    :return: Python datetime object in UTC.
+    :param filename: The JSON, JSONL or binary name file (see get_business_names.py).
+    :return: The VendorIndex, or None if the file can not be read.
     """
-
-    # Determine correct time format
-    time_format = "%I:%M %p" if ":" in time_str else "%I %p"
-
-    # Combine date and time string
-    utc_datetime = datetime.datetime.strptime(f"{date} {time_str}", f"%Y-%m-%d {time_format}")
-    utc_datetime = utc_datetime.replace(tzinfo=datetime.timezone.utc)
-    # Ensure it's a naive datetime (no timezone info), Firestore expects naive UTC datetime
-    return utc_datetime
-
-def convert_hours_string_to_dict(hours_string: str):
-    """
-    Converts an hours string format into a dictionary.
-
-    :param hours_string: String containing opening hours in the given format.
-    :return: Dictionary with day as key and hours as value.
-    """
-
-    # Fix: Replace Unicode narrow no-break spaces (`\u202f`) with standard spaces
-    hours_string = hours_string.replace("\u202f", " ")
-
-    # Fixed regex pattern: Now correctly captures both "11 am-8:30 pm" and "11:30 am-8 pm"
-    pattern = r"(\w+): \[([\d:]+ ?[ap]m-[\d:]+ ?[ap]m)\]"
-
-    # Extract matches
-    matches = re.findall(pattern, hours_string)
-
-    # Convert matches into dictionary (Fix: Unpack only day & time_range)
-    hours_dict = {day: time_range for day, time_range in matches}
-
-    return hours_dict
-
-
-def resize_google_image_url(image_url: str, scale_factor: int = 7):
-    """
-    Modifies a Google image URL to change the width (w) and height (h) by a given scale factor.
-
-    :param image_url: The original Google image URL.
-    :param scale_factor: The factor by which to multiply the dimensions (default: 3x).
-    :return: The modified URL with updated dimensions.
-    """
-
-    # Regular expression to find width (w) and height (h) parameters
-    pattern = r"w(\d+)-h(\d+)"
-    match = re.search(pattern, image_url)
-
-    if match:
-        # Extract current width and height
-        width, height = int(match.group(1)), int(match.group(2))
-
-        # Scale dimensions
-        new_width, new_height = width * scale_factor, height * scale_factor
-
-        # Replace in URL
-        updated_url = re.sub(pattern, f"w{new_width}-h{new_height}", image_url)
-
-        return updated_url
-
-    return image_url  # Return original if no match found
+    try:
+        return VendorIndex.from_file(filename)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error reading file: {e}")
+        return None
+    
 
 # Example usage
-#extract_business_data("G-Maps-Extractor-10-restaurants-2025-02-10.csv", "businesses.json")
-extract_business_data("others_leyton.csv", "businesses.json")
+if __name__ == "__main__":
+    #extract_business_data("G-Maps-Extractor-10-restaurants-2025-02-10.csv", "businesses.json")
+    extract_business_data("others_leyton.csv", "businesses.json")
 
 """ "openingHours": {
                 day: {
@@ -1,372 +1,250 @@
 import pandas as pd
 import json
-import firebase_admin
-from firebase_admin import messaging, credentials, firestore
-import re
-import datetime
-import time 
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from firebase_admin import messaging, firestore
+from http_cache import cached_get
+from contact_crawl import crawl_contacts
+from place_resolver import get_place_resolver
+from place_cache import STATUS_ERROR, STATUS_FOUND, get_place_cache
+from page_ready import readiness_stats
+from rate_control import call_with_retry, get_rate_controller
+import argparse
 import asyncio
-
-# Function to set up Selenium WebDriver
-def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
-
-# Function to extract website from Google Place ID
+import os
+from csv_stream import DEFAULT_CHUNK_SIZE, iter_csv_chunks
+from firestore_batch import BatchWriter
+from opening_hours import compile_opening_hours, opening_hours_cache_info
+from transform import HOURS_KEY_COLUMN, LAT_COLUMN, LON_COLUMN, POSTCODE_COLUMN, UK_POSTCODE_PATTERN, transform_chunk
+from vendor_index import VendorIndex
+from vendor_record import VendorRecord
+from vendor_sync import VendorSnapshot
+from email_harvest import emails_from_html, harvest_emails, normalize_website_url
+from instrumentation import RunMetrics
+from notifications import MODE_EACH, OnboardingNotifier, postcode_area
+from checkpoint import STAGE_EMAIL, STAGE_WEBSITE, STAGE_WRITTEN, CheckpointJournal, default_journal_path
+from firebase_app import init_firebase
+
+# Function to look up the website of a Google Place ID, over HTTP first and in the browser if needed, returns (website, status)
+def lookup_website_from_place_id(place_id):
+    return get_place_resolver().lookup(place_id)
+
+# Lookups that failed (blocked page, dead browser) are retried after a jittered backoff
+def lookup_website_with_retry(place_id):
+    return call_with_retry(lookup_website_from_place_id, place_id, retry_if=lambda result: result[1] == STATUS_ERROR)
+
+# Function to extract website from Google Place ID, answered from the local cache when possible
 def get_website_from_place_id(place_id):
-    driver = setup_driver()
-    
-    try:
-        maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-        driver.get(maps_url)
-        time.sleep(5)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        try:
-            website = soup.find("a", {"data-item-id": "authority"}).get("href")
-        except AttributeError:
-            website = None
-
-        driver.quit()
-        return website
-
-    except Exception as e:
-        driver.quit()
-        print(f"Error fetching website for Place ID {place_id}: {e}")
-        return None
+    return get_place_cache().resolve(place_id, lookup_website_with_retry)
 
 # Function to extract email from website
 def extract_emails_from_website(website_url):
     if not website_url:
         return None, None  # No website, so no email
 
-    if not website_url.startswith("http"):
-        website_url = "http://" + website_url
+    website_url = normalize_website_url(website_url)
 
     try:
-        response = requests.get(website_url, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        emails = list(set(re.findall(email_pattern, soup.text)))  
-
-        if emails:
-            return emails[0], ", ".join(emails[1:]) if len(emails) > 1 else ""  
-        else:
-            return None, None
+        # The home page first, then contact-like pages until an email turns up
+        return crawl_contacts(lambda url: cached_get(url, timeout=10), emails_from_html, website_url)
 
     except Exception as e:
         print(f"Error fetching email from website {website_url}: {e}")
         return None, None
 
-def fetch_registered_vendors():
-    names_list = []
-    db = firestore.client()
-    docs = db.collection("vendors").get()
-    print("== Fetching data from Firebase ==")
-    for doc in docs:
-        data = doc.to_dict()
-        if "name" in data:
-            names_list.append(data["name"])
-    return names_list
+def fetch_registered_vendors(refresh=True):
+    snapshot = VendorSnapshot()
+    if refresh:
+        db = firestore.client()
+        # Only the name/place ID of new vendors is downloaded after the first run
+        changed = snapshot.refresh(db)
+        print(f"== Fetched {changed} changed vendors from Firebase ==")
+    return snapshot.names()
 
 # Function to process and upload business data
-async def extract_business_data(file_path):
-    df = pd.read_csv(file_path)
-    
+async def extract_business_data(file_path, chunksize=DEFAULT_CHUNK_SIZE, limit=10, refresh_vendors=True, report_path=None, profile=False, trace_memory=False, notification_mode=MODE_EACH, digest_window=3600, resume=False, journal_path=None, fuzzy=False):
+    """
+    Uploads the new vendors of a G-Maps export to Firestore.
+
+    :param file_path: Path of the CSV export.
+    :param chunksize: Number of CSV rows processed at a time.
+    :param limit: Maximum number of vendors to add, or None for no limit.
+    :param refresh_vendors: Sync the vendor snapshot with Firestore first (sharded
+                            workers reuse the snapshot refreshed by the parent).
+    :param report_path: Path of the JSON run report, defaults to `<file>_report.json`.
+                        A Prometheus textfile is written next to it with a `.prom` suffix.
+    :param profile: Also save a cProfile capture of the run (`<report>.prof`).
+    :param trace_memory: Also add the top tracemalloc allocations to the report.
+    :param notification_mode: "each" for one notification per new vendor, "digest" for one
+                              per postcode area and `digest_window` seconds.
+    :param digest_window: Seconds of new vendors combined into one digest notification.
+    :param resume: Skip the stages a previous run of the same file completed, as recorded
+                   in its checkpoint journal. Without it the journal is started over.
+    :param journal_path: Path of the checkpoint journal, defaults to `<file>.journal.jsonl`.
+    :param fuzzy: Also report names that look like a registered vendor ("Possible duplicate").
+                  Off by default, the trigram lookup is much slower than the exact check.
+    :return: Dictionary summarizing the run.
+    """
+    metrics = RunMetrics(os.path.basename(file_path), profile=profile, trace_memory=trace_memory)
+    report_path = report_path or os.path.splitext(file_path)[0] + "_report.json"
+
     selected_columns = ["Name", "Description", "Categories", "Fulladdress", "Phone", "Phones", "Featured Image", "Latitude", "Longitude", "Street", "Website", "Place Id", "Opening Hours"]
-    
-    for col in selected_columns:
-        if col not in df.columns:
-            df[col] = ""
-    
-    df_selected = df[selected_columns].fillna("")
-    
-    df_selected["Phones"] = df_selected["Phones"].astype(str).apply(lambda x: x.split(",")[0].replace(" ", "") if pd.notna(x) else "")
-    df_selected["Phone"] = df_selected["Phone"].astype(str).apply(lambda x: x.replace(" ", ""))
-    
-    # Add Email Column
-    df_selected["Email"] = ""
-    print("== Fetched data from CSV ==")
 
     # Initialize Firebase
-    cred = credentials.Certificate("credentials_prod.json")
-    firebase_admin.initialize_app(cred)
+    init_firebase()
     db = firestore.client()
-    registered_vendors = fetch_registered_vendors()
+    writer = BatchWriter(db, metrics=metrics)
+    notifier = OnboardingNotifier(db, messaging, mode=notification_mode, digest_window=digest_window, metrics=metrics)
+    registered_vendors = VendorIndex(fetch_registered_vendors(refresh_vendors), fuzzy=fuzzy)
     print("== Fetched registered vendors == " + str(len(registered_vendors)))
+    place_cache = get_place_cache()
+    journal = CheckpointJournal(journal_path or default_journal_path(file_path), reset=not resume)
     
     #postcode_pattern = r"E\d{2} \w{3}"
-    postcode_pattern = r"([Gg][Ii][Rr] 0[Aa]{2})|((([A-Za-z][0-9]{1,2})|(([A-Za-z][A-Ha-hJ-Yj-y][0-9]{1,2})|(([A-Za-z][0-9][A-Za-z])|([A-Za-z][A-Ha-hJ-Yj-y][0-9][A-Za-z]?))))\s?[0-9][A-Za-z]{2})"
+    postcode_pattern = UK_POSTCODE_PATTERN
     count = 0
-    for _, row in df_selected.iterrows():
-        if count==10:
-            return
-        isVendorExists = row["Name"] in registered_vendors
-        if isVendorExists:
-            print(f"Already exists: {row['Name']}")
-            continue
-        postcode_match = re.search(postcode_pattern, row["Fulladdress"])
-        postcode = postcode_match.group() if postcode_match else None
-        doc_ref = db.collection("vendors").document()
-        doc_id = doc_ref.id
-        openingHoursRow = convert_hours_string_to_dict(row["Opening Hours"])
-        openingHours = parse_opening_hours(openingHoursRow)
-        hdImageUrl = resize_google_image_url(row["Featured Image"])
-        
-        # Fetch Website and Extract Email
-        website = row["Website"]
-        if not website:
-            website = get_website_from_place_id(row["Place Id"])
-        
-        email, additional_emails = extract_emails_from_website(website) if website else (None, None)
-        print("== Fetched email:", email)
-        
-        # Assign email to DataFrame
-        df_selected.at[_, "Email"] = email if email else ""
+    summary = {"rows": 0, "added": 0, "failed": 0, "existing": 0, "invalid": 0, "resumed": 0}
 
-        business_data = {
-            "active": True,
-            "address": row["Fulladdress"],
-            "category": row["Categories"],
-            "city": "London",
-            "contact": row["Phones"],
-            "country": "United Kingdom",
-            "description": row["Description"],
-            "dynamicLink": "",
-            "email": email if email else "",
-            "additional_emails": additional_emails if additional_emails else "",
-            "endTime": firestore.SERVER_TIMESTAMP,
-            "images": [hdImageUrl],
-            "isVerified": True,
-            "latitude": row["Latitude"],
-            "line1": row["Street"],
-            "location": firestore.GeoPoint(float(row["Latitude"]), float(row["Longitude"])),
-            "longitude": row["Longitude"],
-            "name": row["Name"],
-            "openingHours": openingHours,
-            "ownerId": doc_id,
-            "phone": row["Phone"],
-            "pincode": postcode,
-            "qrCode": "",
-            "rating": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0, "count": 0, "rating": 0},
-            "ratings": [],
-            "socialLinks": {"facebookId": "", "instaId": ""},
-            "startTime": firestore.SERVER_TIMESTAMP,
-            "state": "NA",
-            "uid": doc_id,
-            "website": row["Website"],
-            "extracted": True,
-            "claimed": False,
-            "google_place_id": row["Place Id"],
-            "workingDays": {day: True for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
-        }
+    # Each chunk is resolved, enriched and written before the next one is read
+    for df_selected in metrics.timed("csv_load", iter_csv_chunks(file_path, selected_columns, chunksize)):
+        if count==limit:
+            break
 
-        isVendorExists = row["Name"] in registered_vendors
-        if isVendorExists:
-            print(f"Already exists: {row['Name']}")
-        else:
-            count+=1
-            doc_ref.set(business_data)
-            send_shop_onboard_notification(row["Fulladdress"], row["Name"], doc_id)
-            registered_vendors.append(row["Name"])
-            print(f"Vendor added: {row['Name']}")
-            
-    """ df_selected.to_csv(output_json, index=False)
-    print(f"\n✅ Data successfully saved to {output_json}") """
-
-
-def send_shop_onboard_notification(address: str, name: str, vendor_id: str):
-    """
-    Sends an FCM notification when a new shop is onboarded.
-
-    :param address: The address of the shop.
-    :param name: The name of the shop.
-    :param vendor_id: The vendor ID.
-    """
-    title = "New Shop is Onboarded!!!"
-    body = f"{name} is opened at {address}"
-    topic = "vendorAdd"
-
-    # Constructing the message
-    message = messaging.Message(
-        notification=messaging.Notification(
-            title=title,
-            body=body
-        ),
-        data={
-            "type": topic,
-            "vendorId": vendor_id
-        },
-        topic=topic
-    )
-
-    # Sending the notification
-    response = messaging.send(message)
-    db = firestore.client()
-    doc_ref = db.collection("userNotifications").document()
-    userNotification = {
-        "body": body,
-        "title": title,
-        "redirectLink": vendor_id,
-        "timestamp": firestore.SERVER_TIMESTAMP,
-    }
-    doc_ref.set(userNotification)
-    print("Successfully sent message:", response)
-
-def parse_opening_hours(row: dict):
-    """
-    Converts CSV row opening hours into Firestore openingHours format.
-
-    :param row: Dictionary containing days as keys and their opening hours as values.
-    :return: Dictionary formatted for Firestore.
-    """
-
-    # Default hours for days that might be missing
-    default_hours = {
-        "Monday": "10 am-8:30 pm",
-        "Tuesday": "10 am-8:30 pm",
-        "Wednesday": "10 am-8:30 pm",
-        "Thursday": "10 am-8:30 pm",
-        "Friday": "10 am-8:30 pm",
-        "Saturday": "10 am-8:30 pm",
-        "Sunday": "10 am-8 pm"
-    }
-
-    # Get the current date to construct timestamps
-    today = datetime.date.today()
-
-    opening_hours = {}
-
-    for day in default_hours.keys():
-        # Check if the day is present in the row; if not, mark it as closed
-        if day in row:
-            hours = row[day]
-            is_open = True
-        else:
-            hours = default_hours[day]  # Use default hours
-            is_open = False  # Mark as closed
-
-        # Extract start and end time
-        start_time, end_time = hours.split("-")
-
-        # Define time format dynamically based on presence of minutes
-        today = datetime.date.today()
-        start_datetime = convert_to_utc_datetime(today, start_time)
-        end_datetime = convert_to_utc_datetime(today, end_time)
-
-        # Add Firestore timestamps
-        opening_hours[day] = {
-            "startTime": start_datetime,  # Firestore Timestamp with given datetime
-            "endTime": end_datetime,  # Firestore Timestamp with given datetime
-            "isOpen": is_open
-        }
-
-    return opening_hours
-
-
-def convert_to_utc_datetime(date: datetime.date, time_str: str):
-    """
-    Converts a given time string into a Firestore-compatible UTC datetime.
-
-    Assumes the input time is already in UTC.
-
-    :param date: The date to use (typically today’s date).
-    :param time_str: The time string (e.g., "11 am" or "8:30 pm").
-    :return: Python datetime object in UTC.
-    """
-
-    # Determine correct time format
-    time_format = "%I:%M %p" if ":" in time_str else "%I %p"
-
-    # Combine date and time string
-    utc_datetime = datetime.datetime.strptime(f"{date} {time_str}", f"%Y-%m-%d {time_format}")
-    utc_datetime = utc_datetime.replace(tzinfo=datetime.timezone.utc)
-    # Ensure it's a naive datetime (no timezone info), Firestore expects naive UTC datetime
-    return utc_datetime
-
-
-def convert_hours_string_to_dict(hours_string: str):
-    """
-    Converts an hours string format into a dictionary.
-
-    :param hours_string: String containing opening hours in the given format.
-    :return: Dictionary with day as key and hours as value.
-    """
-
-    # Fix: Replace Unicode narrow no-break spaces (`\u202f`) with standard spaces
-    hours_string = hours_string.replace("\u202f", " ")
-
-    # Fixed regex pattern: Now correctly captures both "11 am-8:30 pm" and "11:30 am-8 pm"
-    pattern = r"(\w+): \[([\d:]+ ?[ap]m-[\d:]+ ?[ap]m)\]"
-
-    # Extract matches
-    matches = re.findall(pattern, hours_string)
-
-    # Convert matches into dictionary (Fix: Unpack only day & time_range)
-    hours_dict = {day: time_range for day, time_range in matches}
-
-    return hours_dict
-
-def resize_google_image_url(image_url: str, scale_factor: int = 7):
-    """
-    Modifies a Google image URL to change the width (w) and height (h) by a given scale factor.
-    
-    This function supports both patterns `w80-h80` and `w=80&h=80` in the image URL.
-
-    :param image_url: The original Google image URL.
-    :param scale_factor: The factor by which to multiply the dimensions (default: 7x).
-    :return: The modified URL with updated dimensions.
-    """
-    
-    # Regular expression to find both width (w) and height (h) patterns
-    pattern_1 = r"w(\d+)-h(\d+)"  # Pattern for 'w80-h80'
-    pattern_2 = r"w=(\d+)&h=(\d+)"  # Pattern for 'w=80&h=80'
-
-    # Try to match the first pattern
-    match_1 = re.search(pattern_1, image_url)
-    if match_1:
-        # Extract current width and height from 'w80-h80' pattern
-        width, height = int(match_1.group(1)), int(match_1.group(2))
+        # Derived columns (phones, postcode, image, hours key, coordinates) for the whole chunk
+        with metrics.stage("transform", rows=len(df_selected)):
+            df_selected = transform_chunk(df_selected, postcode_pattern)
         
-        # Scale dimensions
-        new_width, new_height = width * scale_factor, height * scale_factor
-        
-        # Replace in URL
-        updated_url = re.sub(pattern_1, f"w{new_width}-h{new_height}", image_url)
-        return updated_url
+        # Add Email Column
+        df_selected["Email"] = ""
+        print(f"== Fetched {len(df_selected)} rows from CSV ==")
+        summary["rows"] += len(df_selected)
+
+        # Rows that already carry a website answer their Place ID lookup for free
+        place_cache.warm((place_id, website, STATUS_FOUND) for place_id, website in zip(df_selected["Place Id"], df_selected["Website"]) if website)
+
+        pending = []
+        for _, row in zip(df_selected.index, df_selected.to_dict(orient="records")):
+            if count==limit:
+                break
+            # Rows without a Place ID are journaled under their name
+            key = row["Place Id"] or row["Name"]
+            if journal.done(key, STAGE_WRITTEN):
+                summary["resumed"] += 1
+                registered_vendors.add(row["Name"])
+                continue
+            with metrics.stage("dedupe"):
+                isVendorExists = row["Name"] in registered_vendors
+            if isVendorExists:
+                print(f"Already exists: {row['Name']}")
+                summary["existing"] += 1
+                metrics.count("existing")
+                continue
+            if pd.isna(row[LAT_COLUMN]) or pd.isna(row[LON_COLUMN]):
+                print(f"Invalid coordinates, skipping: {row['Name']}")
+                summary["invalid"] += 1
+                metrics.count("invalid")
+                continue
+            if fuzzy:
+                with metrics.stage("dedupe"):
+                    similar = registered_vendors.find_similar(row["Name"])
+                if similar:
+                    print(f"Possible duplicate: {row['Name']} ~ {similar[0][0]} ({similar[0][1]:.2f})")
+                    metrics.count("possible_duplicates")
+
+            # Fetch Website, emails are harvested concurrently for all rows below
+            website = row["Website"]
+            if not website and journal.done(key, STAGE_WEBSITE):
+                website = journal.get(key, STAGE_WEBSITE)
+            elif not website and row["Place Id"]:
+                with metrics.stage("place_id_resolution"):
+                    website = get_website_from_place_id(row["Place Id"])
+                journal.record(key, STAGE_WEBSITE, website)
 
-    # Try to match the second pattern
-    match_2 = re.search(pattern_2, image_url)
-    if match_2:
-        # Extract current width and height from 'w=80&h=80' pattern
-        width, height = int(match_2.group(1)), int(match_2.group(2))
+            count+=1
+            registered_vendors.add(row["Name"])
+            pending.append((_, key, row, website))
+
+        # Emails found by an interrupted run are taken from the journal
+        emails = {website: tuple(journal.get(key, STAGE_EMAIL)) for _, key, _, website in pending if website and journal.done(key, STAGE_EMAIL)}
+        websites = [website for _, _, _, website in pending if website and website not in emails]
+        print(f"== Fetching emails from {len(websites)} websites ==")
+        with metrics.stage("email_fetch", rows=len(websites)):
+            harvested = await harvest_emails(websites)
+        metrics.count("emails_found", sum(1 for email, _ in harvested.values() if email))
+        emails.update(harvested)
+        for _, key, _, website in pending:
+            if website in harvested:
+                journal.record(key, STAGE_EMAIL, list(harvested[website]))
+
+        onboarded = []
+        for _, key, row, website in pending:
+            doc_ref = db.collection("vendors").document()
+            doc_id = doc_ref.id
+            # Businesses share a handful of distinct hours strings, each is parsed once
+            openingHours = compile_opening_hours(row[HOURS_KEY_COLUMN])
         
-        # Scale dimensions
-        new_width, new_height = width * scale_factor, height * scale_factor
+            email, additional_emails = emails.get(website, (None, None)) if website else (None, None)
+            print("== Fetched email:", email)
         
-        # Replace in URL
-        updated_url = re.sub(pattern_2, f"w={new_width}&h={new_height}", image_url)
-        return updated_url
-
-    # If no match found, return original URL
-    return image_url
+            # Assign email to DataFrame
+            df_selected.at[_, "Email"] = email if email else ""
+
+            # Only the variable fields are set per row, the rest comes from a shared template
+            record = VendorRecord.from_row(row, openingHours, email, additional_emails)
+
+            writer.set(doc_ref, record.to_firestore(doc_id, firestore))
+            onboarded.append((doc_ref.path, doc_id, key, row))
+
+        # Vendors are only counted, and subscribers notified, once their documents are committed
+        writer.flush()
+        failed_paths = {path for path, _ in writer.failed}
+        for path, doc_id, key, row in onboarded:
+            if path in failed_paths:
+                print(f"Vendor write failed: {row['Name']}")
+                summary["failed"] += 1
+                metrics.count("failed")
+                # Not in Firestore, so a later row with the same name is not a duplicate
+                registered_vendors.discard(row["Name"])
+                continue
+            print(f"Vendor added: {row['Name']}")
+            summary["added"] += 1
+            metrics.count("added")
+            journal.record(key, STAGE_WRITTEN, doc_id)
+            notifier.enqueue(row["Name"], row["Fulladdress"], doc_id, postcode_area(row[POSTCODE_COLUMN]))
+        journal.sync()
+
+    # Commit whatever is left in the last batch
+    writer.flush()
+    journal.close()
+    summary["notifications"] = notifier.close()
+    print("== Notifications ==", summary["notifications"])
+    print("== Batched writes ==", writer.summary())
+    print("== Page readiness ==", readiness_stats.summary())
+    print("== Place ID tiers ==", get_place_resolver().summary())
+    print("== Opening hours cache ==", opening_hours_cache_info())
+    print(f"== Place cache == hits: {place_cache.hits}, misses: {place_cache.misses}")
+    print("== Rate control ==", get_rate_controller().summary())
+
+    metrics.count("place_cache_hits", place_cache.hits)
+    metrics.count("place_cache_misses", place_cache.misses)
+    for tier, count in get_place_resolver().answers.items():
+        metrics.count(f"place_id_{tier}_answers", count)
+    summary["writes"] = writer.summary()
+    metrics.write_report(report_path, os.path.splitext(report_path)[0] + ".prom")
+    summary["report"] = report_path
+    return summary
 
 
 # Example Usage
 #extract_business_data("test.csv")
-asyncio.run(extract_business_data("E20.csv"))
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload the new vendors of a G-Maps export to Firestore.")
+    parser.add_argument("file", nargs="?", default="E20.csv", help="CSV export to ingest")
+    parser.add_argument("--limit", type=int, default=10, help="maximum number of vendors to add (0 for no limit)")
+    parser.add_argument("--resume", action="store_true", help="skip the work a previous run of this file completed")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE, help="rows read at a time")
+    parser.add_argument("--notifications", choices=["each", "digest"], default=MODE_EACH, help="one notification per vendor or a digest per area")
+    parser.add_argument("--profile", action="store_true", help="save a cProfile capture next to the run report")
+    parser.add_argument("--fuzzy", action="store_true", help="also report possible duplicates with similar names")
+    args = parser.parse_args()
+
+    asyncio.run(extract_business_data(args.file, args.chunksize, args.limit or None, resume=args.resume,
+                                      notification_mode=args.notifications, profile=args.profile, fuzzy=args.fuzzy))
@@ -0,0 +1,41 @@
+import functools
+import os
+
+DEFAULT_CREDENTIALS = "credentials_prod.json"
+
+# Overrides the key path, inherited by spawned worker processes
+CREDENTIALS_ENV = "LP_FIREBASE_CREDENTIALS"
+
+
+@functools.lru_cache(maxsize=None)
+def init_firebase(credentials_path: str = None):
+    """
+    Initializes the default Firebase app once per process.
+
+    The SDK is imported here rather than at module level, so modes that never
+    touch Firebase (e.g. CSV to JSON) do not pay for loading it. Calling it
+    again, or after the app was initialized elsewhere, returns the same app.
+
+    :param credentials_path: Path of the service account key, defaults to
+                             $LP_FIREBASE_CREDENTIALS or `credentials_prod.json`.
+    :return: The default firebase_admin App.
+    """
+    import firebase_admin
+    from firebase_admin import credentials
+
+    try:
+        return firebase_admin.get_app()
+    except ValueError:
+        path = credentials_path or os.environ.get(CREDENTIALS_ENV, DEFAULT_CREDENTIALS)
+        return firebase_admin.initialize_app(credentials.Certificate(path))
+
+
+def get_db(credentials_path: str = None):
+    """
+    :param credentials_path: Path of the service account key, used on first initialization.
+    :return: The Firestore client of the default app.
+    """
+    from firebase_admin import firestore
+
+    init_firebase(credentials_path)
+    return firestore.client()
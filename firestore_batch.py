@@ -0,0 +1,107 @@
+import time
+
+# Firestore rejects a single commit with more than 500 writes
+MAX_BATCH_SIZE = 500
+
+
+class BatchWriter:
+    """
+    Groups Firestore `set` operations into WriteBatch commits of up to 500 writes.
+
+    Writes added together with `set_group` (e.g. a vendor and its userNotifications
+    document) always land in the same commit. The batch is flushed automatically
+    when it is full and must be flushed once more at the end of a run.
+    """
+
+    def __init__(self, db, max_batch_size: int = MAX_BATCH_SIZE, metrics=None, stage: str = "firestore_write"):
+        """
+        :param db: The Firestore client.
+        :param max_batch_size: Maximum number of writes per commit (capped at 500).
+        :param metrics: Optional RunMetrics, each commit is recorded as a call of `stage`.
+        :param stage: Stage name the commits are recorded under.
+        """
+        self.db = db
+        self.metrics = metrics
+        self.stage = stage
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self._pending = []
+        self.batch_latencies = []
+        self.committed = 0
+        self.failed = []
+
+    def set(self, doc_ref, data: dict):
+        """
+        Queues a single document write.
+
+        :param doc_ref: The Firestore document reference.
+        :param data: The document data.
+        """
+        self.set_group([(doc_ref, data)])
+
+    def set_group(self, writes: list):
+        """
+        Queues writes that have to be committed together.
+
+        :param writes: List of (doc_ref, data) tuples.
+        """
+        if len(writes) > self.max_batch_size:
+            raise ValueError(f"Group of {len(writes)} writes exceeds batch size {self.max_batch_size}")
+
+        # Flush first so the whole group fits in the next commit
+        if len(self._pending) + len(writes) > self.max_batch_size:
+            self.flush()
+
+        self._pending.extend(writes)
+
+        if len(self._pending) == self.max_batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Commits all pending writes in one WriteBatch.
+
+        :return: Number of writes committed.
+        """
+        if not self._pending:
+            return 0
+
+        writes, self._pending = self._pending, []
+        batch = self.db.batch()
+        for doc_ref, data in writes:
+            batch.set(doc_ref, data)
+
+        start = time.perf_counter()
+        try:
+            batch.commit()
+        except Exception as e:
+            latency = time.perf_counter() - start
+            self.batch_latencies.append(latency)
+            if self.metrics:
+                self.metrics.record(self.stage, latency, len(writes), error=True)
+            self.failed.extend((doc_ref.path, str(e)) for doc_ref, _ in writes)
+            print(f"Batch of {len(writes)} writes failed after {latency:.3f}s: {e}")
+            return 0
+
+        latency = time.perf_counter() - start
+        self.batch_latencies.append(latency)
+        if self.metrics:
+            self.metrics.record(self.stage, latency, len(writes))
+        self.committed += len(writes)
+        print(f"== Committed batch of {len(writes)} writes in {latency:.3f}s ==")
+        return len(writes)
+
+    def summary(self) -> dict:
+        """
+        Returns the write statistics collected so far.
+
+        :return: Dictionary with committed/failed counts and batch latencies.
+        """
+        latencies = self.batch_latencies
+        return {
+            "batches": len(latencies),
+            "committed": self.committed,
+            "failed": len(self.failed),
+            "failed_paths": [path for path, _ in self.failed],
+            "total_latency": sum(latencies),
+            "max_latency": max(latencies) if latencies else 0,
+        }
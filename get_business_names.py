@@ -1,27 +1,32 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 import json
+from firebase_app import get_db
+from name_export import DEFAULT_PARTITIONS, export_names
 
-# Initialize Firebase Admin SDK (Ensure this is only done once)
-cred = credentials.Certificate("credentials_prod.json")  # Replace with actual path
-firebase_admin.initialize_app(cred)
-
-def save_names_from_firestore(collection_name: str, output_filename: str = "names.json"):
+def save_names_from_firestore(collection_name: str, output_filename: str = "names.json", partitions: int = DEFAULT_PARTITIONS):
     """
     Fetches all documents from a Firestore collection, extracts the 'name' field, 
     and saves it as a JSON file.
 
+    A `.jsonl` or `.bin` output filename switches to the partitioned parallel
+    export (see name_export.export_names), which streams the names to disk
+    instead of building the whole list in memory.
+
     :param collection_name: The Firestore collection to fetch documents from.
     :param output_filename: The filename to save the extracted names as JSON.
+    :param partitions: Number of partitions scanned in parallel by the streaming export.
     """
-    # Initialize Firestore
-    db = firestore.client()
+    # Initialize Firebase (once per process) and Firestore
+    db = get_db()
+
+    if not output_filename.endswith(".json"):
+        export_names(db, collection_name, output_filename, partitions)
+        return
 
-    # Fetch all documents from the collection
-    docs = db.collection(collection_name).stream()
+    # Fetch only the 'name' field of each document
+    docs = db.collection(collection_name).select(["name"]).stream()
 
     # Extract 'name' from each document
-    names = [doc.to_dict().get("name") for doc in docs if "name" in doc.to_dict()]
+    names = [name for name in ((doc.to_dict() or {}).get("name") for doc in docs) if name]
 
     # Save the list to a JSON file
     with open(output_filename, "w") as json_file:
@@ -30,4 +35,5 @@ def save_names_from_firestore(collection_name: str, output_filename: str = "name
     print(f"Names successfully saved to {output_filename}")
 
 # Example usage
-save_names_from_firestore("vendors")
+if __name__ == "__main__":
+    save_names_from_firestore("vendors")
@@ -0,0 +1,200 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from email_scanner import MAX_PAGE_BYTES, read_capped
+from rate_control import OUTCOME_THROTTLED, THROTTLE_STATUSES, backoff_delay, get_rate_controller, retry_after_seconds
+
+DEFAULT_CACHE_DIR = ".http_cache"
+DEFAULT_TTL = 7 * 24 * 3600  # 7 days
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+POOL_SIZE = 50
+USER_AGENT = "Mozilla/5.0 (compatible; LP-BusinessExtract)"
+
+
+@functools.lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests session with keep-alive connection pooling.
+
+    :return: The shared requests.Session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class ResponseCache:
+    """
+    Persistent response cache keyed by URL, one JSON file per entry.
+
+    Entries younger than `ttl` are served without touching the network, older
+    entries are revalidated with If-None-Match / If-Modified-Since. The least
+    recently used entries are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param cache_dir: Directory holding the cache entries.
+        :param ttl: Number of seconds an entry is served without revalidation.
+        :param max_bytes: Maximum total size of the cache directory.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str):
+        """
+        :param url: The requested URL.
+        :return: The cached entry dictionary, or None.
+        """
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def validators(self, entry: dict) -> dict:
+        """
+        :param entry: A cached entry, or None.
+        :return: Conditional request headers for revalidating the entry.
+        """
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, body: str, headers=None):
+        """
+        Stores a response body together with its validators.
+
+        :param url: The requested URL.
+        :param body: The response text.
+        :param headers: The response headers (ETag / Last-Modified are kept).
+        """
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": body,
+        }
+        self._write(url, entry)
+
+    def refresh(self, url: str, entry: dict):
+        """
+        Restarts the TTL of an entry after a 304 Not Modified response.
+        """
+        entry["stored_at"] = time.time()
+        self._write(url, entry)
+
+    def _write(self, url: str, entry: dict):
+        path = self._path(url)
+        data = json.dumps(entry).encode("utf-8")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            try:
+                old_size = os.path.getsize(path)
+            except FileNotFoundError:
+                old_size = 0
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._size += len(data) - old_size
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache is at 90% of its limit
+        entries = sorted((e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")), key=lambda e: e.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self._size <= target:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            self._size -= size
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    """
+    :return: The process-wide ResponseCache.
+    """
+    return ResponseCache()
+
+
+def cached_get(url: str, timeout: float = 10, cache: ResponseCache = None, attempts: int = 3, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    """
+    Fetches a page through the shared session and the on-disk response cache.
+
+    Requests are paced by the adaptive limiter of the URL's domain. Throttled
+    responses (429/503) and network errors are retried after a jittered backoff.
+
+    :param url: The URL to fetch.
+    :param timeout: Request timeout in seconds.
+    :param cache: The ResponseCache to use (defaults to the shared one).
+    :param attempts: Maximum number of requests.
+    :param max_bytes: The body is streamed and cut off after this many bytes.
+    :return: The response text.
+    """
+    cache = cache or get_response_cache()
+    entry = cache.get(url)
+    if entry and cache.is_fresh(entry):
+        return entry["body"]
+
+    limiter = get_rate_controller().for_url(url)
+    for attempt in range(attempts):
+        try:
+            with limiter.slot() as slot:
+                response = get_session().get(url, headers=cache.validators(entry), timeout=timeout, stream=True)
+                if response.status_code in THROTTLE_STATUSES:
+                    slot.mark(OUTCOME_THROTTLED, retry_after_seconds(response.headers))
+                    if attempt < attempts - 1:
+                        response.close()
+        except requests.RequestException:
+            if attempt == attempts - 1:
+                raise
+        else:
+            if response.status_code not in THROTTLE_STATUSES or attempt == attempts - 1:
+                break
+        time.sleep(backoff_delay(attempt))
+
+    if response.status_code == 304 and entry:
+        response.close()
+        cache.refresh(url, entry)
+        return entry["body"]
+
+    text = read_capped(response, max_bytes)
+    if response.status_code == 200:
+        cache.put(url, text, response.headers)
+    return text
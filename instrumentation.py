@@ -0,0 +1,211 @@
+import contextlib
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+METRIC_PREFIX = "lp_extract"
+
+
+def current_peak_rss_bytes() -> int:
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(samples: list, q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+
+class RunMetrics:
+    """
+    Times every pipeline stage, counts events and errors, and writes a run report.
+
+    Usage:
+
+        metrics = RunMetrics("extractor2")
+        with metrics.stage("email_fetch", rows=len(websites)):
+            ...
+        metrics.count("vendors_added")
+        metrics.write_report("run_report.json", "run_report.prom")
+
+    Stages and counters may be recorded from other threads (e.g. the notifier's).
+    """
+
+    def __init__(self, run_name: str, profile: bool = False, trace_memory: bool = False):
+        """
+        :param run_name: Name of the pipeline, used as the `run` label.
+        :param profile: Capture a cProfile profile of the whole run.
+        :param trace_memory: Capture the top tracemalloc allocations of the run.
+        """
+        self.run_name = run_name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._profiler = None
+        self._trace_memory = trace_memory
+
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if trace_memory:
+            tracemalloc.start()
+
+    def _stage(self, name: str) -> dict:
+        if name not in self.stages:
+            self.stages[name] = {"samples": [], "rows": 0, "errors": 0}
+        return self.stages[name]
+
+    def record(self, name: str, seconds: float, rows: int = 1, error: bool = False):
+        """
+        Records one timed call of a stage.
+
+        :param name: The stage name.
+        :param seconds: Duration of the call.
+        :param rows: Number of rows the call processed.
+        :param error: Whether the call failed.
+        """
+        with self._lock:
+            stage = self._stage(name)
+            stage["samples"].append(seconds)
+            stage["rows"] += rows
+            if error:
+                stage["errors"] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: int = 1):
+        """
+        Times the `with` block as one call of stage `name`, exceptions count as errors.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(name, time.perf_counter() - start, rows, error=True)
+            raise
+        self.record(name, time.perf_counter() - start, rows)
+
+    def timed(self, name: str, iterable):
+        """
+        Yields the items of `iterable`, timing each step as one call of stage `name`
+        (used for lazy readers such as `iter_csv_chunks`).
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except BaseException:
+                self.record(name, time.perf_counter() - start, 0, error=True)
+                raise
+            self.record(name, time.perf_counter() - start, len(item) if hasattr(item, "__len__") else 1)
+            yield item
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """
+        :return: Dictionary with per-stage latency statistics, counters and memory.
+        """
+        with self._lock:
+            snapshot = {name: (list(stage["samples"]), stage["rows"], stage["errors"]) for name, stage in self.stages.items()}
+            counters = dict(self.counters)
+
+        stages = {}
+        for name, (samples, rows, errors) in snapshot.items():
+            samples.sort()
+            calls = len(samples)
+            stages[name] = {
+                "calls": calls,
+                "rows": rows,
+                "errors": errors,
+                "error_rate": round(errors / calls, 4) if calls else 0,
+                "total_seconds": round(sum(samples), 6),
+                "p50_seconds": round(_percentile(samples, 0.50), 6),
+                "p95_seconds": round(_percentile(samples, 0.95), 6),
+                "p99_seconds": round(_percentile(samples, 0.99), 6),
+                "max_seconds": round(samples[-1], 6) if samples else 0,
+            }
+
+        return {
+            "run": self.run_name,
+            "started_at": self.started_at,
+            "duration_seconds": round(time.perf_counter() - self._start, 3),
+            "peak_rss_bytes": current_peak_rss_bytes(),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def prometheus_text(self, report: dict = None) -> str:
+        """
+        Formats the report in the Prometheus textfile collector format.
+        """
+        report = report or self.report()
+        run = report["run"]
+        lines = [
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f'{METRIC_PREFIX}_run_duration_seconds{{run="{run}"}} {report["duration_seconds"]}',
+            f"# TYPE {METRIC_PREFIX}_peak_rss_bytes gauge",
+            f'{METRIC_PREFIX}_peak_rss_bytes{{run="{run}"}} {report["peak_rss_bytes"]}',
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for name, stage in report["stages"].items():
+            labels = f'run="{run}",stage="{name}"'
+            lines.append(f'{METRIC_PREFIX}_stage_seconds{{{labels},quantile="0.5"}} {stage["p50_seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds{{{labels},quantile="0.99"}} {stage["p99_seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{{labels}}} {stage["total_seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{{labels}}} {stage["calls"]}')
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_rows_total counter")
+        for name, stage in report["stages"].items():
+            lines.append(f'{METRIC_PREFIX}_stage_rows_total{{run="{run}",stage="{name}"}} {stage["rows"]}')
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_errors_total counter")
+        for name, stage in report["stages"].items():
+            lines.append(f'{METRIC_PREFIX}_stage_errors_total{{run="{run}",stage="{name}"}} {stage["errors"]}')
+        lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+        for name, value in report["counters"].items():
+            lines.append(f'{METRIC_PREFIX}_events_total{{run="{run}",event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, json_path: str = "run_report.json", prom_path: str = None) -> dict:
+        """
+        Writes the JSON report, and optionally the Prometheus textfile and the
+        cProfile / tracemalloc captures next to it.
+
+        :param json_path: Path of the JSON report.
+        :param prom_path: Path of the Prometheus textfile, or None.
+        :return: The report dictionary.
+        """
+        if self._profiler:
+            self._profiler.disable()
+            self._profiler.dump_stats(json_path.rsplit(".", 1)[0] + ".prof")
+
+        report = self.report()
+        if self._trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            report["top_allocations"] = [
+                {"where": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:25]
+            ]
+            tracemalloc.stop()
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+        if prom_path:
+            # Write then rename so the node exporter never reads a partial file
+            with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text(report))
+            os.replace(prom_path + ".tmp", prom_path)
+
+        print(f"== Run report saved to {json_path} ==")
+        return report
@@ -1,32 +1,29 @@
-import pandas as pd
-import json
+from csv_stream import DEFAULT_CHUNK_SIZE, iter_csv_chunks
+from output_writers import FORMAT_JSON, open_writer
+from transform import first_phone
 
-def extract_business_data(file_path, output_json):
-    """Extracts business details from CSV and saves to JSON."""
-    # Load CSV file
-    df = pd.read_csv(file_path)
-    
+def extract_business_data(file_path, output_json, chunksize=DEFAULT_CHUNK_SIZE):
+    """
+    Extracts business details from CSV and saves to JSON.
+
+    The extension of the output picks the format (.json, .jsonl, .csv or
+    .parquet, text formats optionally .gz/.bz2/.xz compressed), see output_writers.
+    Any other extension is written as JSON, as before.
+    """
     # Select required columns
     selected_columns = ["Name", "Description", "Fulladdress", "Phone", "Phones", "Featured Image", "Latitude", "Longitude"]
-    
-    # Ensure required columns exist
-    missing_columns = set(selected_columns) - set(df.columns)
-    if missing_columns:
-        raise ValueError(f"Missing required columns: {missing_columns}")
-    
-    df_selected = df[selected_columns]
-    
-    # Process 'Phones' column to extract the first phone number
-    df_selected["Phones"] = df_selected["Phones"].astype(str).apply(lambda x: x.split(",")[0] if pd.notna(x) else "")
-    
-    # Convert to dictionary
-    business_list = df_selected.to_dict(orient="records")
-    
-    # Save to JSON
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(business_list, f, indent=4)
-    
+
+    # Each chunk is written as soon as it is processed
+    with open_writer(output_json, selected_columns, default_format=FORMAT_JSON) as writer:
+        # Load CSV file one chunk at a time, missing required columns raise a ValueError
+        for df_selected in iter_csv_chunks(file_path, selected_columns, chunksize, required=True, fillna=False):
+            # Process 'Phones' column to extract the first phone number (spaces kept, as before)
+            df_selected["Phones"] = first_phone(df_selected["Phones"], remove_spaces=False)
+
+            writer.write_chunk(df_selected)
+
     print(f"Data successfully saved to {output_json}")
 
 # Example usage
-extract_business_data("G-Maps-Extractor-10-restaurants-2025-02-10.csv", "businesses.json")
\ No newline at end of file
+if __name__ == "__main__":
+    extract_business_data("G-Maps-Extractor-10-restaurants-2025-02-10.csv", "businesses.json")
@@ -0,0 +1,141 @@
+import json
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PARTITIONS = 8
+DEFAULT_FIELDS = ("name",)
+WRITE_BUFFER_SIZE = 1000
+
+FORMAT_JSONL = "jsonl"
+FORMAT_BIN = "bin"
+
+# Binary name index: magic, uint32 record count, then uint16 length + UTF-8 name per record
+BIN_MAGIC = b"LPNAMES1"
+_BIN_HEADER = struct.Struct("<8sI")
+_BIN_LENGTH = struct.Struct("<H")
+MAX_NAME_BYTES = 0xFFFF
+
+
+def format_for_path(path: str) -> str:
+    return FORMAT_BIN if path.endswith(".bin") else FORMAT_JSONL
+
+
+class _JsonlSink:
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: list):
+        self._file.write("".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records))
+
+    def close(self):
+        self._file.close()
+
+
+class _BinarySink:
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._file.write(_BIN_HEADER.pack(BIN_MAGIC, 0))
+        self.count = 0
+
+    def write(self, records: list):
+        chunks = []
+        for record in records:
+            name = (record.get("name") or "").encode("utf-8")
+            if len(name) > MAX_NAME_BYTES:
+                # Cut on a character boundary, a split UTF-8 sequence would not decode
+                name = name[:MAX_NAME_BYTES].decode("utf-8", errors="ignore").encode("utf-8")
+            if name:
+                chunks.append(_BIN_LENGTH.pack(len(name)) + name)
+        self._file.write(b"".join(chunks))
+        self.count += len(chunks)
+
+    def close(self):
+        # The count is only known at the end, patch it into the header
+        self._file.seek(0)
+        self._file.write(_BIN_HEADER.pack(BIN_MAGIC, self.count))
+        self._file.close()
+
+
+def iter_names(path: str):
+    """
+    Yields the names of an export written by export_names (JSONL or binary).
+
+    :param path: The export file.
+    """
+    if format_for_path(path) == FORMAT_BIN:
+        with open(path, "rb") as f:
+            magic, count = _BIN_HEADER.unpack(f.read(_BIN_HEADER.size))
+            if magic != BIN_MAGIC:
+                raise ValueError(f"{path} is not a vendor name index")
+            for _ in range(count):
+                (length,) = _BIN_LENGTH.unpack(f.read(_BIN_LENGTH.size))
+                yield f.read(length).decode("utf-8")
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            name = json.loads(line).get("name")
+            if name:
+                yield name
+
+
+def export_names(db, collection_name: str = "vendors", output_path: str = "names.jsonl", partitions: int = DEFAULT_PARTITIONS,
+                 fields=DEFAULT_FIELDS) -> int:
+    """
+    Exports the projected fields of every document of a collection, scanning partitions in parallel.
+
+    The collection is split with `get_partitions` into ranges of document IDs
+    that are streamed concurrently. Only `fields` are read (a `select`
+    projection) and records are appended to the output as they arrive, so
+    memory stays flat however large the collection grows.
+
+    Partitions come from a collection group query, documents of sub-collections
+    with the same name are skipped so only the top-level collection is exported.
+
+    :param db: The Firestore client.
+    :param collection_name: The collection to export.
+    :param output_path: Output file, `.jsonl` for one {"id", <fields>} object per
+                        line, `.bin` for a compact name index (see iter_names).
+    :param partitions: Number of partitions scanned in parallel.
+    :param fields: Fields to export.
+    :return: Number of documents exported.
+    """
+    fields = list(fields)
+    tmp_path = output_path + ".tmp"
+    sink = _BinarySink(tmp_path) if format_for_path(output_path) == FORMAT_BIN else _JsonlSink(tmp_path)
+    lock = threading.Lock()
+
+    def scan(partition) -> int:
+        buffer = []
+        exported = 0
+        for doc in partition.query().select(fields).stream():
+            # Partitions cover every collection with this name, keep the top-level one only
+            if doc.reference.parent.parent is not None:
+                continue
+            data = doc.to_dict() or {}
+            if not data.get("name"):
+                continue
+            buffer.append({"id": doc.id, **{field: data.get(field) for field in fields}})
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                with lock:
+                    sink.write(buffer)
+                exported += len(buffer)
+                buffer = []
+        with lock:
+            sink.write(buffer)
+        return exported + len(buffer)
+
+    query_partitions = list(db.collection_group(collection_name).get_partitions(partitions))
+    print(f"== Exporting {collection_name} in {len(query_partitions)} partitions ==")
+    try:
+        with ThreadPoolExecutor(max_workers=len(query_partitions)) as executor:
+            total = sum(executor.map(scan, query_partitions))
+    finally:
+        sink.close()
+
+    # Readers never see a half written export
+    os.replace(tmp_path, output_path)
+    print(f"== Exported {total} documents to {output_path} ==")
+    return total
@@ -1,35 +1,22 @@
-import re
-import time
-import requests
+from http_cache import cached_get
+from email_scanner import scan_emails
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Function to set up Selenium WebDriver
-def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+from driver_pool import get_driver_pool
+from page_ready import ADDRESS_SELECTOR, NAME_SELECTOR, PHONE_SELECTOR, WEBSITE_SELECTOR, wait_for_place_page
 
 # Function to extract business details using Google Place ID
 def get_business_details(place_id):
-    driver = setup_driver()
-    
     try:
-        # Navigate to Google Maps business page
-        maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-        driver.get(maps_url)
-        time.sleep(5)  # Allow page to load
+        # Borrow a warm browser from the shared pool
+        with get_driver_pool().driver() as driver:
+            # Navigate to Google Maps business page
+            maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+            driver.get(maps_url)
+            # Wait for the scraped elements instead of a fixed delay
+            wait_for_place_page(driver, (NAME_SELECTOR, ADDRESS_SELECTOR, PHONE_SELECTOR, WEBSITE_SELECTOR))
+            page_source = driver.page_source
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = BeautifulSoup(page_source, "html.parser")
 
         # Extract Business Name
         try:
@@ -55,8 +42,6 @@ def get_business_details(place_id):
         except AttributeError:
             website = "N/A"
 
-        driver.quit()
-
         # Print Extracted Data
         business_data = {
             "Name": name,
@@ -69,7 +54,6 @@ def get_business_details(place_id):
         return business_data
 
     except Exception as e:
-        driver.quit()
         print(f"Error fetching business details: {e}")
         return None
 
@@ -79,12 +63,10 @@ def extract_email_from_website(website_url):
         website_url = "http://" + website_url  # Ensure valid URL format
 
     try:
-        response = requests.get(website_url, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+        html = cached_get(website_url, timeout=10)
 
-        # Find all emails in the page
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        emails = re.findall(email_pattern, soup.text)
+        # Find all emails in the page, in page order
+        emails = scan_emails(html)
 
         return emails[0] if emails else "Email Not Found"
 
@@ -92,9 +74,10 @@ def extract_email_from_website(website_url):
         print(f"Error fetching email from website: {e}")
         return "Email Not Found"
 
-# Example: Replace with your own Google Place ID
-place_id = "ChIJ6agvSFUbdkgR3PO7Wiq5wyA"  # Example Place ID
-business_info = get_business_details(place_id)
+if __name__ == "__main__":
+    # Example: Replace with your own Google Place ID
+    place_id = "ChIJ6agvSFUbdkgR3PO7Wiq5wyA"  # Example Place ID
+    business_info = get_business_details(place_id)
 
-# Print extracted details
-print(business_info)
+    # Print extracted details
+    print(business_info)
@@ -1,119 +1,103 @@
-import pandas as pd
-import re
-import time
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Function to set up Selenium WebDriver
-def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
-
-# Function to extract website from Google Place ID
+import asyncio
+from csv_stream import DEFAULT_CHUNK_SIZE, iter_csv_chunks, read_csv_header
+from http_cache import cached_get
+from contact_crawl import crawl_contacts
+from place_resolver import get_place_resolver
+from email_harvest import emails_from_html, harvest_emails, normalize_website_url
+from place_cache import STATUS_ERROR, get_place_cache
+from page_ready import readiness_stats
+from rate_control import call_with_retry
+from output_writers import FORMAT_CSV, open_writer
+
+# Function to look up the website of a Google Place ID, over HTTP first and in the browser if needed, returns (website, status)
+def lookup_website_from_place_id(place_id):
+    return get_place_resolver().lookup(place_id)
+
+# Lookups that failed (blocked page, dead browser) are retried after a jittered backoff
+def lookup_website_with_retry(place_id):
+    return call_with_retry(lookup_website_from_place_id, place_id, retry_if=lambda result: result[1] == STATUS_ERROR)
+
+# Function to extract website from Google Place ID, answered from the local cache when possible
 def get_website_from_place_id(place_id):
-    driver = setup_driver()
-    
-    try:
-        # Open Google Maps business page
-        maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-        driver.get(maps_url)
-        time.sleep(5)  # Allow page to load
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # Extract Website URL
-        try:
-            website = soup.find("a", {"data-item-id": "authority"}).get("href")
-        except AttributeError:
-            website = None
-
-        driver.quit()
-        return website
-
-    except Exception as e:
-        driver.quit()
-        print(f"Error fetching website for Place ID {place_id}: {e}")
-        return None
+    return get_place_cache().resolve(place_id, lookup_website_with_retry)
 
 # Function to extract emails from website
 def extract_emails_from_website(website_url):
     if not website_url:
         return None, None  # No website, so no email
 
-    if not website_url.startswith("http"):
-        website_url = "http://" + website_url  # Ensure valid URL format
+    website_url = normalize_website_url(website_url)  # Ensure valid URL format
 
     try:
-        response = requests.get(website_url, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all emails in the page
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        emails = list(set(re.findall(email_pattern, soup.text)))  # Remove duplicates
-
-        if emails:
-            return emails[0], ", ".join(emails[1:]) if len(emails) > 1 else ""  # First email & additional emails
-        else:
-            return None, None
+        # First email & additional emails, from the home page or its contact pages
+        return crawl_contacts(lambda url: cached_get(url, timeout=10), emails_from_html, website_url)
 
     except Exception as e:
         print(f"Error fetching email from website {website_url}: {e}")
         return None, None
 
 # Function to process CSV file
-def process_csv(input_csv, output_csv):
-    # Load the CSV
-    df = pd.read_csv(input_csv)
-
+def process_csv(input_csv, output_csv, chunksize=DEFAULT_CHUNK_SIZE):
     # Ensure 'Place Id' column exists
-    if 'Place Id' not in df.columns:
+    if 'Place Id' not in read_csv_header(input_csv):
         print("Error: CSV file must contain a 'Place Id' column")
         return
 
-    # Create new columns 'Email' & 'Additional Emails'
-    df['Email'] = ""
-    df['Additional Emails'] = ""
-
-    # Iterate through each row
-    for index, row in df.iterrows():
-        place_id = row['Place Id']
-        
-        print(f"Processing Place ID: {place_id}")
-
-        # Get website from Place ID
-        website = get_website_from_place_id(place_id)
-
-        if website:
-            print(f"  ↳ Website Found: {website}")
-            email, additional_emails = extract_emails_from_website(website)
-
-            if email:
-                df.at[index, 'Email'] = email
-                df.at[index, 'Additional Emails'] = additional_emails
-                print(f"  ✅ Email Found: {email}")
-                if additional_emails:
-                    print(f"  ✅ Additional Emails: {additional_emails}")
-            else:
-                print("  ❌ No Email Found")
-        else:
-            print("  ❌ No Website Found")
-
-    # Save updated CSV with all original columns + new email columns
-    df.to_csv(output_csv, index=False)
+    # The output format follows its extension (.csv, .jsonl, .parquet, ...), anything else is CSV as before
+    with open_writer(output_csv, default_format=FORMAT_CSV) as writer:
+        # Load the CSV one chunk at a time, each chunk is written before the next is read
+        for df in iter_csv_chunks(input_csv, chunksize=chunksize, fillna=False):
+            # Create new columns 'Email' & 'Additional Emails'
+            df['Email'] = ""
+            df['Additional Emails'] = ""
+
+            # Resolve the website of each row first
+            websites = {}
+            for index, row in df.iterrows():
+                place_id = row['Place Id']
+
+                # Blank Place IDs have nothing to look up
+                if not isinstance(place_id, str) or not place_id.strip():
+                    print("  ❌ No Place ID, skipping")
+                    continue
+
+                print(f"Processing Place ID: {place_id}")
+
+                # Get website from Place ID
+                website = get_website_from_place_id(place_id)
+
+                if website:
+                    print(f"  ↳ Website Found: {website}")
+                    websites[index] = website
+                else:
+                    print("  ❌ No Website Found")
+
+            # Fetch all websites concurrently
+            print(f"Fetching emails from {len(websites)} websites")
+            emails = asyncio.run(harvest_emails(websites.values()))
+
+            for index, website in websites.items():
+                email, additional_emails = emails.get(website, (None, None))
+
+                if email:
+                    df.at[index, 'Email'] = email
+                    df.at[index, 'Additional Emails'] = additional_emails
+                    print(f"  ✅ Email Found for {website}: {email}")
+                    if additional_emails:
+                        print(f"  ✅ Additional Emails: {additional_emails}")
+                else:
+                    print(f"  ❌ No Email Found for {website}")
+
+            # Save updated chunk with all original columns + new email columns
+            writer.write_chunk(df)
+
     print(f"\n✅ Process Completed! Emails saved to: {output_csv}")
+    print("Page readiness:", readiness_stats.summary())
+    print("Place ID tiers:", get_place_resolver().summary())
+    print(f"Place cache hits: {get_place_cache().hits}, misses: {get_place_cache().misses}")
 
 # Example usage
-input_csv = "G-Maps-Extractor-10-restaurants-2025-02-10.csv"   # Your input CSV file
-output_csv = "businesses_with_emails.csv"  # Output file with extracted emails
-process_csv(input_csv, output_csv)
+if __name__ == "__main__":
+    input_csv = "G-Maps-Extractor-10-restaurants-2025-02-10.csv"   # Your input CSV file
+    output_csv = "businesses_with_emails.csv"  # Output file with extracted emails
+    process_csv(input_csv, output_csv)
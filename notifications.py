@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+
+from firebase_admin import firestore
+
+from firestore_batch import BatchWriter
+
+ONBOARD_TOPIC = "vendorAdd"
+ONBOARD_TITLE = "New Shop is Onboarded!!!"
+
+# FCM accepts at most 500 messages per send_each call
+MAX_SEND_BATCH = 500
+
+MODE_EACH = "each"
+MODE_DIGEST = "digest"
+
+# Shops without a postcode are grouped under the city
+DEFAULT_AREA = "London"
+
+_STOP = object()
+
+
+def postcode_area(postcode) -> str:
+    """
+    Returns the outward code of a UK postcode ("E20 1GS" -> "E20"), used to group digests.
+    """
+    if isinstance(postcode, str) and postcode.strip():
+        return postcode.split()[0].upper()
+    return DEFAULT_AREA
+
+
+class OnboardingEvent:
+    __slots__ = ("name", "address", "vendor_id", "area")
+
+    def __init__(self, name: str, address: str, vendor_id: str, area: str = DEFAULT_AREA):
+        self.name = name
+        self.address = address
+        self.vendor_id = vendor_id
+        self.area = area
+
+
+class OnboardingNotifier:
+    """
+    Sends the "new shop" notifications of an ingestion run off the hot path.
+
+    `enqueue` only puts the event on a queue. A background thread sends the
+    queued events with `messaging.send_each` in batches of up to 500 and writes
+    the matching `userNotifications` documents through its own BatchWriter.
+
+    In digest mode the events of a time window are combined into one
+    notification per postcode area ("12 new shops in E20"), which is what
+    subscribers should see during a borough import.
+
+    Usage:
+
+        notifier = OnboardingNotifier(db, messaging, mode="digest")
+        notifier.enqueue(name, address, vendor_id, postcode_area(postcode))
+        ...
+        notifier.close()
+    """
+
+    def __init__(self, db, messaging, mode: str = MODE_EACH, topic: str = ONBOARD_TOPIC,
+                 batch_size: int = MAX_SEND_BATCH, max_delay: float = 5.0, digest_window: float = 3600, metrics=None):
+        """
+        :param db: The Firestore client.
+        :param messaging: The firebase_admin.messaging module.
+        :param mode: "each" for one notification per shop, "digest" for one per area and window.
+        :param topic: FCM topic the notifications are sent to.
+        :param batch_size: Maximum number of messages per send_each call (capped at 500).
+        :param max_delay: Seconds a queued event may wait before its batch is sent (each mode).
+        :param digest_window: Seconds of events combined into one digest (digest mode).
+                              Whatever is pending is sent when the notifier is closed.
+        :param metrics: Optional RunMetrics, each send_each call is recorded as a `notification` call
+                        and each userNotifications commit as a `notification_write` call.
+        """
+        if mode not in (MODE_EACH, MODE_DIGEST):
+            raise ValueError(f"Unknown notification mode {mode!r}")
+
+        self.messaging = messaging
+        self.mode = mode
+        self.topic = topic
+        self.batch_size = min(batch_size, MAX_SEND_BATCH)
+        self.max_delay = max_delay if mode == MODE_EACH else digest_window
+        self.metrics = metrics
+        # Only the worker thread touches this writer, its commits are kept apart from the vendor writes
+        self.writer = BatchWriter(db, metrics=metrics, stage="notification_write")
+        self.collection = db.collection("userNotifications")
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="onboarding-notifier", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, name: str, address: str, vendor_id: str, area: str = DEFAULT_AREA):
+        """
+        Queues the notification of a newly onboarded shop, returns immediately.
+
+        :param name: The name of the shop.
+        :param address: The address of the shop.
+        :param vendor_id: The vendor ID.
+        :param area: The postcode area the shop is grouped under in digest mode.
+        """
+        self.queued += 1
+        self._queue.put(OnboardingEvent(name, address, vendor_id, area))
+
+    def close(self) -> dict:
+        """
+        Sends everything still queued, commits the pending userNotifications and stops the worker.
+
+        :return: Dictionary with the queued/sent/failed counts.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+        return self.summary()
+
+    def summary(self) -> dict:
+        return {"mode": self.mode, "queued": self.queued, "sent": self.sent, "failed": self.failed}
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                event = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+
+            if event is _STOP:
+                self._deliver(pending)
+                self.writer.flush()
+                return
+
+            if event is not None:
+                if not pending:
+                    deadline = time.monotonic() + self.max_delay
+                pending.append(event)
+
+            window_over = deadline is not None and time.monotonic() >= deadline
+            if window_over or (self.mode == MODE_EACH and len(pending) >= self.batch_size):
+                self._deliver(pending)
+                pending = []
+                deadline = None
+
+    def _deliver(self, events: list):
+        if not events:
+            return
+        if self.mode == MODE_DIGEST:
+            notifications = self._digests(events)
+        else:
+            notifications = [(ONBOARD_TITLE, f"{e.name} is opened at {e.address}", e.vendor_id, [e.vendor_id]) for e in events]
+
+        for start in range(0, len(notifications), self.batch_size):
+            self._send_batch(notifications[start:start + self.batch_size])
+        # Digests are rare, commit them now instead of waiting for a full batch
+        if self.mode == MODE_DIGEST:
+            self.writer.flush()
+
+    def _digests(self, events: list) -> list:
+        by_area = {}
+        for event in events:
+            by_area.setdefault(event.area, []).append(event)
+
+        digests = []
+        for area, area_events in by_area.items():
+            if len(area_events) == 1:
+                e = area_events[0]
+                digests.append((ONBOARD_TITLE, f"{e.name} is opened at {e.address}", e.vendor_id, [e.vendor_id]))
+                continue
+            names = [e.name for e in area_events]
+            shown = ", ".join(names[:3])
+            others = len(names) - 3
+            body = f"{shown} and {others} more opened in {area}" if others > 0 else f"{shown} opened in {area}"
+            vendor_ids = [e.vendor_id for e in area_events]
+            digests.append((f"{len(area_events)} new shops in {area}!!!", body, vendor_ids[0], vendor_ids))
+        return digests
+
+    def _send_batch(self, notifications: list):
+        messages = [
+            self.messaging.Message(
+                notification=self.messaging.Notification(title=title, body=body),
+                data={"type": self.topic, "vendorId": vendor_id, "count": str(len(vendor_ids))},
+                topic=self.topic,
+            )
+            for title, body, vendor_id, vendor_ids in notifications
+        ]
+
+        start = time.perf_counter()
+        try:
+            response = self.messaging.send_each(messages)
+            results = [r.success for r in response.responses]
+        except Exception as e:
+            print(f"Sending {len(messages)} notifications failed: {e}")
+            results = [False] * len(messages)
+        if self.metrics:
+            self.metrics.record("notification", time.perf_counter() - start, len(messages), error=not all(results))
+
+        for (title, body, vendor_id, vendor_ids), success in zip(notifications, results):
+            if not success:
+                self.failed += 1
+                continue
+            self.sent += 1
+            userNotification = {
+                "body": body,
+                "title": title,
+                "redirectLink": vendor_id,
+                "timestamp": firestore.SERVER_TIMESTAMP,
+            }
+            if len(vendor_ids) > 1:
+                userNotification["vendorIds"] = vendor_ids
+            self.writer.set(self.collection.document(), userNotification)
+        print(f"== Sent {sum(results)}/{len(messages)} onboarding notifications ==")
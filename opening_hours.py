@@ -0,0 +1,124 @@
+import datetime
+import functools
+import re
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Default hours for days that might be missing
+DEFAULT_HOURS = {
+    "Monday": "10 am-8:30 pm",
+    "Tuesday": "10 am-8:30 pm",
+    "Wednesday": "10 am-8:30 pm",
+    "Thursday": "10 am-8:30 pm",
+    "Friday": "10 am-8:30 pm",
+    "Saturday": "10 am-8:30 pm",
+    "Sunday": "10 am-8 pm"
+}
+
+# Captures both "11 am-8:30 pm" and "11:30 am-8 pm"
+HOURS_PATTERN = re.compile(r"(\w+): \[([\d:]+ ?[ap]m-[\d:]+ ?[ap]m)\]")
+
+CACHE_SIZE = 4096
+
+
+def parse_time_minutes(time_str: str) -> int:
+    """
+    Converts a 12-hour time token into minutes after midnight without strptime.
+
+    :param time_str: The time string (e.g., "11 am", "8:30 pm" or "8pm").
+    :return: Minutes after midnight.
+    """
+    time_str = time_str.strip().lower()
+    meridiem = time_str[-2:]
+    clock = time_str[:-2].strip()
+    if ":" in clock:
+        hours, minutes = clock.split(":")
+    else:
+        hours, minutes = clock, 0
+
+    hours, minutes = int(hours), int(minutes)
+    if not 1 <= hours <= 12 or not 0 <= minutes <= 59 or meridiem not in ("am", "pm"):
+        raise ValueError(f"Invalid time: {time_str}")
+    return (hours % 12 + (12 if meridiem == "pm" else 0)) * 60 + minutes
+
+
+def minutes_to_utc_datetime(date: datetime.date, minutes: int) -> datetime.datetime:
+    """
+    :param date: The date to use (typically today’s date).
+    :param minutes: Minutes after midnight.
+    :return: Timezone-aware UTC datetime, as Firestore expects.
+    """
+    return datetime.datetime(date.year, date.month, date.day, minutes // 60, minutes % 60, tzinfo=datetime.timezone.utc)
+
+
+def convert_hours_string_to_dict(hours_string: str):
+    """
+    Converts an hours string format into a dictionary.
+
+    :param hours_string: String containing opening hours in the given format.
+    :return: Dictionary with day as key and hours as value.
+    """
+    # Replace Unicode narrow no-break spaces (`\u202f`) with standard spaces
+    hours_string = hours_string.replace("\u202f", " ")
+    return {day: time_range for day, time_range in HOURS_PATTERN.findall(hours_string)}
+
+
+def _day_entry(date: datetime.date, hours: str, is_open: bool) -> dict:
+    start_time, end_time = hours.split("-")
+    return {
+        "startTime": minutes_to_utc_datetime(date, parse_time_minutes(start_time)),
+        "endTime": minutes_to_utc_datetime(date, parse_time_minutes(end_time)),
+        "isOpen": is_open
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def default_entries(date: datetime.date) -> dict:
+    """
+    Builds the closed-day entries once per date.
+
+    :param date: The date used for the timestamps.
+    :return: Dictionary of day -> closed openingHours entry.
+    """
+    return {day: _day_entry(date, DEFAULT_HOURS[day], False) for day in DAYS}
+
+
+def parse_opening_hours(row: dict, date: datetime.date = None):
+    """
+    Converts CSV row opening hours into Firestore openingHours format.
+
+    :param row: Dictionary containing days as keys and their opening hours as values.
+    :param date: The date used for the timestamps (defaults to today).
+    :return: Dictionary formatted for Firestore.
+    """
+    date = date or datetime.date.today()
+    defaults = default_entries(date)
+
+    # Days missing from the row are marked as closed with the default hours
+    return {day: _day_entry(date, row[day], True) if day in row else defaults[day] for day in DAYS}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(hours_string: str, date: datetime.date) -> dict:
+    return parse_opening_hours(convert_hours_string_to_dict(hours_string), date)
+
+
+def compile_opening_hours(hours_string: str, date: datetime.date = None) -> dict:
+    """
+    Converts an `Opening Hours` CSV value straight into the Firestore openingHours map.
+
+    Results are memoized in a bounded LRU cache, the returned dictionary is shared
+    between rows with the same hours string and must not be modified.
+
+    :param hours_string: The `Opening Hours` value of a row.
+    :param date: The date used for the timestamps (defaults to today).
+    :return: Dictionary formatted for Firestore.
+    """
+    return _compile(hours_string, date or datetime.date.today())
+
+
+def opening_hours_cache_info():
+    """
+    :return: The hits/misses/currsize statistics of the compile cache.
+    """
+    return _compile.cache_info()
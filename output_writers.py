@@ -0,0 +1,244 @@
+import bz2
+import gzip
+import lzma
+
+from vendor_record import JsonRecordTemplate
+
+FORMAT_JSON = "json"
+FORMAT_JSONL = "jsonl"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+
+# Text outputs are compressed on the fly when the path ends with one of these
+COMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+# Rows buffered per Parquet row group, readers load and skip whole row groups
+DEFAULT_ROW_GROUP_SIZE = 100_000
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
+# Parquet columns stored as doubles, every other column is stored as text
+DEFAULT_FLOAT_COLUMNS = ("Latitude", "Longitude")
+
+
+def output_format(path: str):
+    """
+    :param path: Output path, e.g. `businesses.jsonl.gz`.
+    :return: Tuple of (format, compression suffix or None).
+    """
+    compression = next((suffix for suffix in COMPRESSORS if path.endswith(suffix)), None)
+    base = path[:-len(compression)] if compression else path
+    return base.rsplit(".", 1)[-1].lower(), compression
+
+
+class OutputWriter:
+    """
+    Writes the chunks of a run to a file as they are produced.
+
+    Columns are taken from the first chunk unless given, every chunk must have
+    the same columns in the same order.
+
+        with open_writer("businesses.parquet") as writer:
+            for chunk in chunks:
+                writer.write_chunk(chunk)
+    """
+
+    def __init__(self, path: str, columns: list = None):
+        """
+        :param path: Output path.
+        :param columns: Columns of the output, defaults to those of the first chunk.
+        """
+        self.path = path
+        self.columns = list(columns) if columns else None
+        self.rows = 0
+
+    def write_chunk(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+        elif list(df.columns) != self.columns:
+            df = df[self.columns]
+        self._write(df)
+        self.rows += len(df)
+
+    def _write(self, df):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TextOutputWriter(OutputWriter):
+    """
+    Base of the text formats, optionally compressed on the fly.
+    """
+
+    newline = None
+
+    def __init__(self, path: str, columns: list = None, compression: str = None):
+        """
+        :param compression: Compression suffix (see COMPRESSORS), or None.
+        """
+        super().__init__(path, columns)
+        opener = COMPRESSORS[compression] if compression else open
+        self._file = opener(path, "wt", encoding="utf-8", newline=self.newline)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonWriter(TextOutputWriter):
+    """
+    A JSON array of records, same layout as `json.dump(records, indent=4)`.
+    """
+
+    def __init__(self, path: str, columns: list = None, compression: str = None):
+        super().__init__(path, columns, compression)
+        self._template = None
+        self._file.write("[")
+
+    def _write(self, df):
+        if self._template is None:
+            self._template = JsonRecordTemplate(self.columns)
+        # No dictionary is built per row, values go straight into the pre-encoded layout
+        records = ",\n    ".join(map(self._template.encode, df.to_numpy(dtype=object)))
+        if records:
+            self._file.write(("\n    " if self.rows == 0 else ",\n    ") + records)
+
+    def close(self):
+        self._file.write("\n]" if self.rows else "]")
+        super().close()
+
+
+class JsonlWriter(TextOutputWriter):
+    """
+    One compact JSON object per line.
+    """
+
+    def __init__(self, path: str, columns: list = None, compression: str = None):
+        super().__init__(path, columns, compression)
+        self._template = None
+
+    def _write(self, df):
+        if self._template is None:
+            self._template = JsonRecordTemplate(self.columns, indent=None)
+        encode = self._template.encode
+        self._file.write("".join(encode(values) + "\n" for values in df.to_numpy(dtype=object)))
+
+
+class CsvWriter(TextOutputWriter):
+    """
+    CSV with a header line, chunks are appended as they come.
+    """
+
+    newline = ""
+
+    def _write(self, df):
+        df.to_csv(self._file, index=False, header=self.rows == 0)
+
+
+class ParquetWriter(OutputWriter):
+    """
+    Parquet file written one row group at a time, needs pyarrow.
+
+    Chunks are buffered until `row_group_size` rows are collected, so the file
+    has a few large row groups however small the CSV chunks are.
+
+    The schema is fixed up front rather than inferred: CSV chunks infer their
+    dtypes one by one (a Phone column can be int64 in one chunk and text in the
+    next), so `float_columns` are stored as doubles and every other column as text.
+    """
+
+    def __init__(self, path: str, columns: list = None, compression: str = None, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 float_columns=DEFAULT_FLOAT_COLUMNS):
+        """
+        :param compression: Must be None, Parquet is compressed per column with DEFAULT_PARQUET_COMPRESSION.
+        :param row_group_size: Rows per row group.
+        :param float_columns: Columns stored as doubles, values that are not numbers become null.
+        """
+        if compression:
+            raise ValueError(f"Parquet output is already compressed, drop the {compression} suffix from {path}")
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from e
+
+        super().__init__(path, columns)
+        self.row_group_size = row_group_size
+        self.float_columns = set(float_columns)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._writer = None
+        self._buffer = []
+        self._buffered = 0
+
+    def _write(self, df):
+        self._buffer.append(df)
+        self._buffered += len(df)
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        import pandas as pd
+
+        df = self._buffer[0] if len(self._buffer) == 1 else pd.concat(self._buffer, ignore_index=True)
+        if self._writer is None:
+            schema = self._pa.schema([(column, self._pa.float64() if column in self.float_columns else self._pa.string())
+                                      for column in self.columns])
+            self._writer = self._pq.ParquetWriter(self.path, schema, compression=DEFAULT_PARQUET_COMPRESSION)
+
+        arrays = []
+        for field in self._writer.schema:
+            values = df[field.name]
+            if self._pa.types.is_floating(field.type):
+                values = pd.to_numeric(values, errors="coerce")
+            else:
+                values = values.astype(str).astype(object).where(values.notna(), None)
+            arrays.append(self._pa.array(values, type=field.type, from_pandas=True))
+        table = self._pa.Table.from_arrays(arrays, schema=self._writer.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS = {
+    FORMAT_JSON: JsonWriter,
+    FORMAT_JSONL: JsonlWriter,
+    FORMAT_CSV: CsvWriter,
+    FORMAT_PARQUET: ParquetWriter,
+}
+
+
+def open_writer(path: str, columns: list = None, default_format: str = None, **options) -> OutputWriter:
+    """
+    Opens the writer for the format of `path`.
+
+    `.json`, `.jsonl`, `.csv` and `.parquet` are supported, text formats can be
+    compressed by adding `.gz`, `.bz2` or `.xz` (e.g. `businesses.jsonl.gz`).
+    Other formats can be added to WRITERS. Any other extension (or none) is
+    written as `default_format`, or rejected with a ValueError without one.
+
+    :param path: Output path.
+    :param columns: Columns of the output, defaults to those of the first chunk.
+    :param default_format: Format used when the extension is not one of WRITERS.
+    :param options: Writer specific options, e.g. `row_group_size` for Parquet.
+    :return: The OutputWriter, to be closed (or used as a context manager).
+    """
+    fmt, compression = output_format(path)
+    if fmt not in WRITERS:
+        if default_format is None:
+            raise ValueError(f"Unsupported output format '{fmt}' for {path}, expected one of {sorted(WRITERS)}")
+        fmt = default_format
+    return WRITERS[fmt](path, columns, compression, **options)
@@ -0,0 +1,89 @@
+import time
+
+# Elements scraped from a Google Maps place panel
+WEBSITE_SELECTOR = "a[data-item-id=authority]"
+NAME_SELECTOR = "h1.DUwDvf"
+ADDRESS_SELECTOR = "button[data-item-id=address]"
+PHONE_SELECTOR = "button[data-tooltip='Copy phone number']"
+
+# Once the name and address are rendered the info rows are in place, so a missing
+# website (or phone) link at that point means the place simply has none
+PANEL_SELECTORS = (NAME_SELECTOR, ADDRESS_SELECTOR)
+
+# Google redirects to its "unusual traffic" page when it throttles us
+BLOCKED_URL_MARKER = "google.com/sorry/"
+
+DEFAULT_DEADLINE = 10
+POLL_FREQUENCY = 0.1
+
+
+class ReadinessStats:
+    """
+    Collects how long each page took to become ready, grouped by outcome.
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    def record(self, status: str, seconds: float):
+        self.timings.setdefault(status, []).append(seconds)
+
+    def summary(self) -> dict:
+        """
+        :return: Dictionary of status -> count, p50, p90, p99 and max wait in seconds.
+        """
+        result = {}
+        for status, values in self.timings.items():
+            values = sorted(values)
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+            result[status] = {
+                "count": len(values),
+                "p50": round(pick(0.50), 3),
+                "p90": round(pick(0.90), 3),
+                "p99": round(pick(0.99), 3),
+                "max": round(values[-1], 3),
+            }
+        return result
+
+
+readiness_stats = ReadinessStats()
+
+
+def wait_for_place_page(driver, selectors: tuple, deadline: float = DEFAULT_DEADLINE, stats: ReadinessStats = readiness_stats):
+    """
+    Waits until the given elements are on the page instead of sleeping a fixed time.
+
+    Returns early when the place panel has rendered but some of the elements are
+    missing (e.g. a business without a website link).
+
+    :param driver: The Selenium WebDriver that has loaded a place page.
+    :param selectors: CSS selectors of the elements that will be scraped.
+    :param deadline: Maximum number of seconds to wait.
+    :param stats: ReadinessStats collecting the observed wait times.
+    :return: "ready" when every element is present, "partial" when the panel
+             rendered without some of them, "blocked" when Google showed its
+             unusual traffic page, "timeout" when the deadline passed.
+    """
+    # Selenium is only loaded once a page is actually rendered
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def check(driver):
+        if BLOCKED_URL_MARKER in driver.current_url:
+            return "blocked"
+        present = {sel: bool(driver.find_elements(By.CSS_SELECTOR, sel)) for sel in set(selectors) | set(PANEL_SELECTORS)}
+        if all(present[sel] for sel in selectors):
+            return "ready"
+        if all(present[sel] for sel in PANEL_SELECTORS):
+            return "partial"
+        return False
+
+    start = time.perf_counter()
+    try:
+        status = WebDriverWait(driver, deadline, poll_frequency=POLL_FREQUENCY).until(check)
+    except TimeoutException:
+        status = "timeout"
+
+    stats.record(status, time.perf_counter() - start)
+    return status
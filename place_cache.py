@@ -0,0 +1,160 @@
+import functools
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = "place_cache.sqlite3"
+DEFAULT_TTL = 90 * 24 * 3600  # 90 days
+NO_WEBSITE_TTL = 30 * 24 * 3600  # 30 days, places without a website may add one
+UNCONFIRMED_TTL = 24 * 3600  # 1 day, read from the raw Maps page rather than the rendered panel
+
+STATUS_FOUND = "found"
+STATUS_NO_WEBSITE = "no_website"
+STATUS_ERROR = "error"
+STATUS_UNCONFIRMED = "unconfirmed"
+
+STATUS_TTLS = {STATUS_NO_WEBSITE: NO_WEBSITE_TTL, STATUS_UNCONFIRMED: UNCONFIRMED_TTL}
+
+
+class PlaceCache:
+    """
+    Persistent Place ID -> website cache backed by SQLite.
+
+    "no website" is a valid cached answer, failed lookups are never cached.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        :param db_path: Path of the SQLite database file.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Sharded runs share the database between processes, wait for their locks
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                place_id TEXT PRIMARY KEY,
+                website TEXT,
+                status TEXT NOT NULL,
+                resolved_at REAL NOT NULL,
+                ttl REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, place_id: str):
+        """
+        :param place_id: The Google Place ID.
+        :return: Tuple of (website, status) for a non-expired entry, otherwise None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT website, status FROM places WHERE place_id = ? AND resolved_at + ttl > ?",
+                (place_id, time.time()),
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], row[1]
+
+    def put(self, place_id: str, website, status: str, ttl: float = None):
+        """
+        Stores a resolution result.
+
+        :param place_id: The Google Place ID.
+        :param website: The resolved website, or None.
+        :param status: STATUS_FOUND, STATUS_UNCONFIRMED or STATUS_NO_WEBSITE.
+        :param ttl: Number of seconds the entry stays valid (defaults per status).
+        """
+        self.warm([(place_id, website, status)], ttl)
+
+    def warm(self, entries, ttl: float = None):
+        """
+        Inserts or replaces many entries in one transaction.
+
+        :param entries: Iterable of (place_id, website, status) tuples.
+        :param ttl: Number of seconds the entries stay valid (defaults per status).
+        :return: Number of entries written.
+        """
+        now = time.time()
+        rows = [
+            (place_id, website, status, now, ttl or STATUS_TTLS.get(status, DEFAULT_TTL))
+            for place_id, website, status in entries
+            if isinstance(place_id, str) and place_id and status != STATUS_ERROR
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    def invalidate(self, place_ids=None, status: str = None):
+        """
+        Deletes entries in bulk.
+
+        :param place_ids: Place IDs to delete, or None for every entry.
+        :param status: Only delete entries with this status (e.g. STATUS_NO_WEBSITE).
+        :return: Number of entries deleted.
+        """
+        query = "DELETE FROM places WHERE 1 = 1"
+        params = []
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        with self._lock:
+            if place_ids is None:
+                deleted = self._conn.execute(query, params).rowcount
+            else:
+                deleted = sum(
+                    self._conn.execute(query + " AND place_id = ?", params + [place_id]).rowcount
+                    for place_id in place_ids
+                )
+            self._conn.commit()
+        return deleted
+
+    def purge_expired(self):
+        """
+        Deletes every expired entry.
+
+        :return: Number of entries deleted.
+        """
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM places WHERE resolved_at + ttl <= ?", (time.time(),)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def resolve(self, place_id: str, lookup):
+        """
+        Returns the cached website for a Place ID, calling `lookup` on a miss.
+
+        :param place_id: The Google Place ID.
+        :param lookup: Function taking a Place ID and returning (website, status).
+        :return: The website, or None.
+        """
+        cached = self.get(place_id)
+        if cached is not None:
+            return cached[0]
+
+        website, status = lookup(place_id)
+        if status != STATUS_ERROR:
+            self.put(place_id, website, status)
+        return website
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_place_cache() -> PlaceCache:
+    """
+    :return: The process-wide PlaceCache.
+    """
+    return PlaceCache()
@@ -0,0 +1,221 @@
+import functools
+import re
+import time
+
+from email_scanner import read_capped
+from http_cache import get_session
+from page_ready import BLOCKED_URL_MARKER, WEBSITE_SELECTOR, wait_for_place_page
+from place_cache import STATUS_ERROR, STATUS_FOUND, STATUS_NO_WEBSITE, STATUS_UNCONFIRMED
+from rate_control import OUTCOME_ERROR, OUTCOME_THROTTLED, THROTTLE_STATUSES, get_rate_controller, retry_after_seconds, url_domain
+
+MAPS_PLACE_URL = "https://www.google.com/maps/place/?q=place_id:{place_id}"
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+# Maps pages are ~1-2 MB, the place data is in the inline script near the top
+MAX_MAPS_PAGE_BYTES = 4 * 1024 * 1024
+
+# Skips the cookie consent interstitial served to UK/EU visitors
+CONSENT_COOKIES = {"CONSENT": "YES+"}
+
+# In the data embedded in the page a website is stored as ["<url>","<display domain>", ...]
+EMBEDDED_WEBSITE_PATTERN = re.compile(r'\["(https?://[^"\s]{4,2048})","([A-Za-z0-9.-]+\.[A-Za-z]{2,})"')
+
+# The page also embeds nearby and related places, each record carries its own Place ID
+PLACE_ID_PATTERN = re.compile(r'"(ChIJ[A-Za-z0-9_-]{16,})"')
+MAX_RECORD_CHARS = 64 * 1024
+
+# Links to Google's own properties are never the business website
+GOOGLE_DOMAINS = ("google.com", "google.co.uk", "gstatic.com", "googleusercontent.com", "ggpht.com", "youtube.com", "googleapis.com", "goo.gl")
+
+
+def place_records(text: str, place_id: str):
+    """
+    Yields the parts of the embedded data that belong to `place_id`.
+
+    A record runs from an occurrence of the Place ID to the next other Place ID
+    (the start of a nearby or related place), at most MAX_RECORD_CHARS long.
+    Nothing is yielded for an empty Place ID, which would match everywhere.
+    """
+    if not place_id:
+        return
+    start = text.find(place_id)
+    while start != -1:
+        end = min(len(text), start + MAX_RECORD_CHARS)
+        for match in PLACE_ID_PATTERN.finditer(text, start + len(place_id), end):
+            if match.group(1) != place_id:
+                end = match.start()
+                break
+        yield text[start:end]
+        start = text.find(place_id, end)
+
+
+def website_from_maps_html(html: str, place_id: str):
+    """
+    Finds the website of a place in the data embedded in its Google Maps page.
+
+    Only the records of `place_id` itself are searched, so the websites of the
+    nearby places listed on the same page are skipped.
+
+    :param html: The Maps page as served to a plain HTTP client.
+    :param place_id: The Google Place ID the page was requested for.
+    :return: The website URL, or None if it could not be found.
+    """
+    # The data is a JSON string inside a script, undo its escaping first
+    text = html.replace('\\\\"', '"').replace('\\"', '"').replace("\\u003d", "=").replace("\\u0026", "&").replace("\\/", "/")
+    for record in place_records(text, place_id):
+        website = _website_in_record(record)
+        if website:
+            return website
+    return None
+
+
+def _website_in_record(record: str):
+    for match in EMBEDDED_WEBSITE_PATTERN.finditer(record):
+        url, display = match.group(1), match.group(2).lower()
+        domain = url_domain(url)
+        if domain.endswith(GOOGLE_DOMAINS):
+            continue
+        # The display domain is the one Maps shows under the website button
+        if domain.endswith(display[4:] if display.startswith("www.") else display):
+            return url
+    return None
+
+
+class PlaceResolver:
+    """
+    Resolves the website of a Google Place ID with the cheapest tier that answers.
+
+    The HTTP tier fetches the Maps page with the pooled session and reads the
+    website from the embedded data (well under a second). When that finds
+    nothing, the browser tier renders the page in a pooled Chrome (seconds).
+    The embedded data format is undocumented, so an HTTP answer is only
+    STATUS_UNCONFIRMED (cached for a short time) and an empty one is not
+    trusted as "no website". Every answer is counted per tier.
+    """
+
+    def __init__(self, http: bool = True, browser: bool = True, timeout: float = 10):
+        """
+        :param http: Try the HTTP tier first.
+        :param browser: Fall back to the browser tier.
+        :param timeout: Timeout of the HTTP tier in seconds.
+        """
+        self.http = http
+        self.browser = browser
+        self.timeout = timeout
+        self.answers = {TIER_HTTP: 0, TIER_BROWSER: 0}
+        self.latencies = {TIER_HTTP: [], TIER_BROWSER: []}
+        self.failed = 0
+
+    def http_lookup(self, place_id: str):
+        """
+        :return: (website, status), status None when the page gave no conclusive answer.
+        """
+        url = MAPS_PLACE_URL.format(place_id=place_id)
+        try:
+            with get_rate_controller().maps.slot() as slot:
+                response = get_session().get(url, cookies=CONSENT_COOKIES, timeout=self.timeout, stream=True)
+                if response.status_code in THROTTLE_STATUSES or BLOCKED_URL_MARKER in response.url:
+                    response.close()
+                    slot.mark(OUTCOME_THROTTLED, retry_after_seconds(response.headers))
+                    # The browser shares our IP, it would be blocked as well
+                    return None, STATUS_ERROR
+                if response.status_code != 200:
+                    response.close()
+                    slot.mark(OUTCOME_ERROR)
+                    return None, None
+                html = read_capped(response, MAX_MAPS_PAGE_BYTES)
+        except Exception as e:
+            print(f"HTTP lookup failed for Place ID {place_id}: {e}")
+            return None, None
+
+        website = website_from_maps_html(html, place_id)
+        return (website, STATUS_UNCONFIRMED) if website else (None, None)
+
+    def browser_lookup(self, place_id: str):
+        """
+        :return: (website, status) from the page rendered in Chrome.
+        """
+        # Selenium and BeautifulSoup are only loaded when the HTTP tier comes up empty
+        from bs4 import BeautifulSoup
+        from driver_pool import get_driver_pool
+
+        try:
+            # Page loads are paced by the adaptive Google Maps limiter
+            with get_rate_controller().maps.slot() as slot, get_driver_pool().driver() as driver:
+                driver.get(MAPS_PLACE_URL.format(place_id=place_id))
+                # Wait for the website link, or for the panel to render without one
+                readiness = wait_for_place_page(driver, (WEBSITE_SELECTOR,))
+                if readiness == "partial":
+                    return None, STATUS_NO_WEBSITE
+                if readiness == "blocked":
+                    slot.mark(OUTCOME_THROTTLED)
+                    return None, STATUS_ERROR
+                if readiness == "timeout":
+                    slot.mark(OUTCOME_ERROR)
+                page_source = driver.page_source
+
+            soup = BeautifulSoup(page_source, "html.parser")
+
+            try:
+                website = soup.find("a", {"data-item-id": "authority"}).get("href")
+            except AttributeError:
+                website = None
+
+            if website:
+                return website, STATUS_FOUND
+            # A page that never rendered is not a reliable "no website" answer
+            return None, STATUS_ERROR if readiness == "timeout" else STATUS_NO_WEBSITE
+
+        except Exception as e:
+            print(f"Error fetching website for Place ID {place_id}: {e}")
+            return None, STATUS_ERROR
+
+    def lookup(self, place_id: str):
+        """
+        Resolves a Place ID, trying the tiers in order.
+
+        :param place_id: The Google Place ID.
+        :return: Tuple of (website, status) as expected by PlaceCache.resolve.
+        """
+        # Blank cells come through as "" or NaN, there is no page to look up
+        if not isinstance(place_id, str) or not place_id.strip():
+            return None, STATUS_NO_WEBSITE
+
+        tiers = [(TIER_HTTP, self.http_lookup)] if self.http else []
+        if self.browser:
+            tiers.append((TIER_BROWSER, self.browser_lookup))
+
+        for tier, lookup in tiers:
+            start = time.perf_counter()
+            website, status = lookup(place_id)
+            if status is None:
+                continue
+            if status == STATUS_ERROR:
+                break
+            self.answers[tier] += 1
+            self.latencies[tier].append(time.perf_counter() - start)
+            print(f"== Place ID {place_id} resolved by {tier}: {website or 'no website'} ==")
+            return website, status
+
+        self.failed += 1
+        return None, STATUS_ERROR
+
+    def summary(self) -> dict:
+        """
+        :return: Dictionary with the answers and median latency of each tier.
+        """
+        result = {"failed": self.failed}
+        for tier, count in self.answers.items():
+            latencies = sorted(self.latencies[tier])
+            result[tier] = {"answers": count, "p50": round(latencies[len(latencies) // 2], 3) if latencies else None}
+        return result
+
+
+@functools.lru_cache(maxsize=None)
+def get_place_resolver() -> PlaceResolver:
+    """
+    Returns the process-wide PlaceResolver.
+    """
+    return PlaceResolver()
@@ -0,0 +1,260 @@
+import asyncio
+import contextlib
+import functools
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+OUTCOME_OK = "ok"
+OUTCOME_THROTTLED = "throttled"
+OUTCOME_ERROR = "error"
+
+# Responses that mean "slow down" rather than "this site has no email"
+THROTTLE_STATUSES = {429, 503}
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Returns a "full jitter" exponential backoff delay for the given retry attempt (0 based).
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after_seconds(headers) -> float:
+    """
+    Reads a Retry-After header given in seconds (HTTP dates are ignored).
+    """
+    value = (headers or {}).get("Retry-After")
+    try:
+        return min(float(value), 300.0) if value else None
+    except ValueError:
+        return None
+
+
+def call_with_retry(fn, *args, attempts: int = 3, retry_if=None, base: float = 0.5):
+    """
+    Calls `fn(*args)` again after a jittered backoff while `retry_if(result)` is true.
+
+    :param fn: The function to call.
+    :param attempts: Maximum number of calls.
+    :param retry_if: Predicate on the result that asks for another attempt.
+    :param base: Base delay of the backoff in seconds.
+    :return: The result of the last call.
+    """
+    for attempt in range(attempts):
+        result = fn(*args)
+        if attempt == attempts - 1 or not (retry_if and retry_if(result)):
+            return result
+        time.sleep(backoff_delay(attempt, base))
+
+
+def url_domain(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class RequestSlot:
+    """
+    Handed out by AdaptiveLimiter.slot(), the caller marks how the request went.
+    """
+
+    __slots__ = ("outcome", "retry_after")
+
+    def __init__(self):
+        self.outcome = OUTCOME_OK
+        self.retry_after = None
+
+    def mark(self, outcome: str, retry_after: float = None):
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket with an in-flight limit, both adjusted by AIMD.
+
+    Every successful request raises the rate additively (and the in-flight
+    limit by 1/limit), while a throttled or failed request, or one slower than
+    `latency_target`, halves both. Decreases are applied at most once per
+    `cooldown` seconds so one burst of failures does not collapse the rate.
+    A Retry-After from the server pauses the limiter altogether.
+    """
+
+    def __init__(self, name: str, rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 10.0, burst: float = 1.0,
+                 concurrency: float = 2, max_concurrency: float = 8, increase: float = 0.1, decrease: float = 0.5,
+                 latency_target: float = None, cooldown: float = 2.0):
+        """
+        :param name: Name used in summaries and log lines.
+        :param rate: Initial requests per second.
+        :param min_rate: Lowest rate the limiter backs off to.
+        :param max_rate: Highest rate the limiter climbs to.
+        :param burst: Maximum number of tokens saved up while idle.
+        :param concurrency: Initial number of requests allowed in flight.
+        :param max_concurrency: Highest in-flight limit.
+        :param increase: Requests per second added after every success.
+        :param decrease: Factor applied to the rate and in-flight limit on congestion.
+        :param latency_target: Seconds above which a successful request still counts as congestion.
+        :param cooldown: Minimum seconds between two decreases.
+        """
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.limit = concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.counts = {OUTCOME_OK: 0, OUTCOME_THROTTLED: 0, OUTCOME_ERROR: 0}
+
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+
+    def _try_acquire(self) -> float:
+        """
+        Takes a token and an in-flight slot if both are available.
+
+        :return: 0 on success, otherwise the number of seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._in_flight >= int(self.limit):
+                return 0.05
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+
+            self._tokens -= 1
+            self._in_flight += 1
+            return 0
+
+    def acquire(self):
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, outcome: str, latency: float, retry_after: float = None):
+        """
+        Frees the in-flight slot and adjusts the rate from the outcome of the request.
+
+        :param outcome: OUTCOME_OK, OUTCOME_THROTTLED or OUTCOME_ERROR.
+        :param latency: Seconds the request took.
+        :param retry_after: Seconds the server asked us to wait, if any.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            self.counts[outcome] += 1
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+            slow = self.latency_target is not None and latency > self.latency_target
+            if outcome == OUTCOME_OK and not slow:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            elif now - self._decreased_at >= self.cooldown:
+                self._decreased_at = now
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.limit = max(1, self.limit * self.decrease)
+                if outcome == OUTCOME_THROTTLED:
+                    print(f"== Throttled by {self.name}, slowing down to {self.rate:.2f} req/s ==")
+
+    @contextlib.contextmanager
+    def slot(self):
+        """
+        Waits for a slot and times the `with` block as one request, exceptions count as errors.
+        """
+        self.acquire()
+        slot = RequestSlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except BaseException:
+            slot.mark(OUTCOME_ERROR)
+            raise
+        finally:
+            self.release(slot.outcome, time.monotonic() - start, slot.retry_after)
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self):
+        await self.acquire_async()
+        slot = RequestSlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except BaseException:
+            slot.mark(OUTCOME_ERROR)
+            raise
+        finally:
+            self.release(slot.outcome, time.monotonic() - start, slot.retry_after)
+
+    def summary(self) -> dict:
+        return {"name": self.name, "rate": round(self.rate, 3), "concurrency": round(self.limit, 2), **self.counts}
+
+
+class RateController:
+    """
+    One adaptive limiter for Google Maps and one per website domain.
+    """
+
+    def __init__(self, maps_rate: float = 1.0, maps_max_rate: float = 5.0, domain_rate: float = 2.0, domain_max_rate: float = 10.0):
+        """
+        :param maps_rate: Initial Google Maps page loads per second.
+        :param maps_max_rate: Highest Google Maps page loads per second.
+        :param domain_rate: Initial requests per second to a single website domain.
+        :param domain_max_rate: Highest requests per second to a single website domain.
+        """
+        # Maps pages take seconds to render, slower than that means we are being slowed down
+        self.maps = AdaptiveLimiter("google-maps", rate=maps_rate, max_rate=maps_max_rate, concurrency=4,
+                                    max_concurrency=16, increase=0.05, latency_target=15)
+        self.domain_rate = domain_rate
+        self.domain_max_rate = domain_max_rate
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> AdaptiveLimiter:
+        """
+        :return: The limiter of the URL's domain ("www." is ignored).
+        """
+        domain = url_domain(url)
+        with self._lock:
+            if domain not in self._domains:
+                self._domains[domain] = AdaptiveLimiter(domain, rate=self.domain_rate, max_rate=self.domain_max_rate, burst=2,
+                                                        latency_target=8)
+            return self._domains[domain]
+
+    def summary(self) -> dict:
+        limiters = list(self._domains.values())
+        return {
+            "maps": self.maps.summary(),
+            "domains": len(limiters),
+            "throttled_domains": sorted(limiter.name for limiter in limiters if limiter.counts[OUTCOME_THROTTLED]),
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_controller() -> RateController:
+    """
+    Returns the process-wide RateController.
+    """
+    return RateController()
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from csv_stream import DEFAULT_CHUNK_SIZE, iter_csv_chunks, read_csv_header
+from vendor_index import normalize_name
+
+DEFAULT_SHARD_DIR = "shards"
+
+# Outward code of a UK postcode ("E20" in "E20 1JN"), routes a whole area to one shard
+OUTWARD_CODE_PATTERN = r"\b([A-Za-z]{1,2}[0-9][A-Za-z0-9]?)\s?[0-9][A-Za-z]{2}\b"
+
+
+def stable_hash(value: str) -> int:
+    # hash() is salted per process, crc32 gives every run the same routing
+    return zlib.crc32(value.encode("utf-8"))
+
+
+def split_into_shards(input_files: list, shards: int, by: str = "name", shard_dir: str = DEFAULT_SHARD_DIR, chunksize: int = DEFAULT_CHUNK_SIZE) -> list:
+    """
+    Splits one or more G-Maps exports into `shards` CSV partitions.
+
+    Whatever the partitioning, every normalized vendor name is owned by exactly one
+    shard: rows whose name was already routed follow it there, so dedupe inside a
+    worker is also dedupe across workers.
+
+    Every shard has the union of the input columns in one fixed order, exports
+    with other or reordered columns are aligned to it (missing values empty).
+
+    :param input_files: Paths of the CSV exports.
+    :param shards: Number of partitions.
+    :param by: "name" (hash of the name key), "postcode" (hash of the outward code)
+               or "rows" (contiguous chunks of rows, round robin).
+    :param shard_dir: Directory the partitions are written to.
+    :param chunksize: Number of rows read at a time.
+    :return: List of partition paths that received rows.
+    """
+    if by not in ("name", "postcode", "rows"):
+        raise ValueError(f"Unknown partitioning: {by}")
+
+    os.makedirs(shard_dir, exist_ok=True)
+    paths = [os.path.join(shard_dir, f"shard-{index:03d}.csv") for index in range(shards)]
+    written = set()
+    owners = {}
+    chunk_number = 0
+
+    # Shards are appended to without a header, so every chunk must have the same columns
+    columns = list(dict.fromkeys(column for file_path in input_files for column in read_csv_header(file_path)))
+
+    for file_path in input_files:
+        for chunk in iter_csv_chunks(file_path, columns, chunksize=chunksize, fillna=False):
+            keys = chunk["Name"].map(normalize_name)
+
+            if by == "postcode":
+                outward = chunk["Fulladdress"].astype(str).str.extract(OUTWARD_CODE_PATTERN, expand=False).fillna("").str.upper()
+                targets = outward.map(lambda code: stable_hash(code) % shards)
+            elif by == "rows":
+                targets = [chunk_number % shards] * len(chunk)
+            else:
+                targets = keys.map(lambda key: stable_hash(key) % shards)
+
+            # The first shard a name is routed to owns it
+            owned = [owners.setdefault(key, target) if key else target for key, target in zip(keys, targets)]
+            chunk = chunk.assign(_shard=owned)
+
+            for shard, rows in chunk.groupby("_shard"):
+                path = paths[shard]
+                rows.drop(columns="_shard").to_csv(path, index=False, mode="a" if path in written else "w", header=path not in written)
+                written.add(path)
+            chunk_number += 1
+
+    return [path for path in paths if path in written]
+
+
+def run_shard(shard_path: str, limit=None, chunksize: int = DEFAULT_CHUNK_SIZE, notification_mode: str = "each", resume: bool = False, fuzzy: bool = False) -> dict:
+    """
+    Worker entry point: ingests one partition with its own Firestore client and browser pool.
+
+    :param shard_path: Path of the partition CSV.
+    :param limit: Maximum number of vendors added by this shard, or None.
+    :param chunksize: Number of rows processed at a time.
+    :param notification_mode: "each" or "digest", see OnboardingNotifier.
+    :param resume: Skip the work recorded in the shard's checkpoint journal.
+    :param fuzzy: Report possible duplicates, see extractor2.extract_business_data.
+    :return: The run summary of the shard.
+    """
+    # Imported in the worker so every process sets up its own Firebase app
+    from extractor2 import extract_business_data
+
+    summary = asyncio.run(extract_business_data(shard_path, chunksize=chunksize, limit=limit, refresh_vendors=False, notification_mode=notification_mode, resume=resume, fuzzy=fuzzy))
+    summary["shard"] = shard_path
+    return summary
+
+
+def merge_summaries(summaries: list) -> dict:
+    """
+    Adds up the per-shard run summaries.
+
+    :param summaries: Summaries returned by run_shard.
+    :return: One summary for the whole run.
+    """
+    merged = {"shards": len(summaries), "rows": 0, "added": 0, "existing": 0, "invalid": 0,
+              "batches": 0, "committed": 0, "failed": 0, "failed_paths": [], "reports": []}
+    for summary in summaries:
+        for key in ("rows", "added", "existing", "invalid"):
+            merged[key] += summary.get(key, 0)
+        writes = summary.get("writes", {})
+        for key in ("batches", "committed", "failed"):
+            merged[key] += writes.get(key, 0)
+        merged["failed_paths"].extend(writes.get("failed_paths", []))
+        if summary.get("report"):
+            merged["reports"].append(summary["report"])
+    return merged
+
+
+def run_sharded(input_files: list, workers: int = None, by: str = "name", limit=None, shard_dir: str = DEFAULT_SHARD_DIR, chunksize: int = DEFAULT_CHUNK_SIZE, notification_mode: str = "each", resume: bool = False, fuzzy: bool = False) -> dict:
+    """
+    Splits the exports and ingests every partition in its own process.
+
+    :param input_files: Paths of the CSV exports.
+    :param workers: Number of worker processes (defaults to the number of cores).
+    :param by: Partitioning, see split_into_shards.
+    :param limit: Maximum number of vendors added per shard, or None.
+    :param shard_dir: Directory the partitions are written to.
+    :param chunksize: Number of rows processed at a time.
+    :param notification_mode: "each" or "digest". Digests are built per shard, so
+                              partition by postcode to get one digest per area.
+    :param resume: Resume every shard from its checkpoint journal. Partitioning is
+                   deterministic, so the same rows land in the same shard again.
+    :param fuzzy: Report possible duplicates, see extractor2.extract_business_data.
+    :return: The merged run summary.
+    """
+    from firebase_app import get_db
+    from vendor_sync import VendorSnapshot
+
+    workers = workers or os.cpu_count()
+    shard_paths = split_into_shards(input_files, workers, by, shard_dir, chunksize)
+    print(f"== Split {len(input_files)} files into {len(shard_paths)} shards by {by} ==")
+
+    # Refresh the vendor snapshot once, workers only read it
+    VendorSnapshot().refresh(get_db())
+
+    summaries = []
+    # Spawned (not forked) workers start with clean Firebase and gRPC state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(run_shard, path, limit, chunksize, notification_mode, resume, fuzzy): path for path in shard_paths}
+        for future in as_completed(futures):
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"Shard {futures[future]} failed: {e}")
+                continue
+            print(f"== Finished {summary['shard']}: {summary['added']} vendors added ==")
+            summaries.append(summary)
+
+    merged = merge_summaries(summaries)
+    merged["failed_shards"] = len(shard_paths) - len(summaries)
+    print("== Run summary ==", merged)
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest G-Maps exports with one process per shard.")
+    parser.add_argument("files", nargs="+", help="CSV exports to ingest")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--by", choices=["name", "postcode", "rows"], default="name", help="how rows are partitioned")
+    parser.add_argument("--limit", type=int, default=None, help="maximum number of vendors added per shard")
+    parser.add_argument("--shard-dir", default=DEFAULT_SHARD_DIR, help="directory for the partition files")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE, help="rows read at a time")
+    parser.add_argument("--notifications", choices=["each", "digest"], default="each", help="one notification per vendor or a digest per area")
+    parser.add_argument("--resume", action="store_true", help="skip the work a previous run of the same shards completed")
+    parser.add_argument("--fuzzy", action="store_true", help="also report possible duplicates with similar names")
+    args = parser.parse_args()
+
+    run_sharded(args.files, args.workers, args.by, args.limit, args.shard_dir, args.chunksize, args.notifications, args.resume, args.fuzzy)
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+from backfill import resize_images_update
+
+IMAGE = "https://lh5.googleusercontent.com/p/AF1Qip=w1080-h720-k-no"
+
+
+def test_list_images_are_resized():
+    assert resize_images_update({"images": [IMAGE]}, 540) == {"images": ["https://lh5.googleusercontent.com/p/AF1Qip=w540-h360-k-no"]}
+
+
+def test_images_at_target_width_are_skipped():
+    assert resize_images_update({"images": [IMAGE]}, 1080) is None
+
+
+def test_legacy_string_image_is_resized_into_a_list():
+    assert resize_images_update({"images": IMAGE}, 540) == {"images": ["https://lh5.googleusercontent.com/p/AF1Qip=w540-h360-k-no"]}
+    # Rewrapped even at the target width, so every vendor ends up with the same shape
+    assert resize_images_update({"images": IMAGE}, 1080) == {"images": [IMAGE]}
+
+
+def test_missing_images_are_skipped():
+    assert resize_images_update({}) is None
@@ -0,0 +1,28 @@
+from vendor_index import VendorIndex, normalize_name
+
+
+def test_latin_names_share_a_key():
+    assert normalize_name("Joe's Café Ltd.") == normalize_name("JOES CAFE") == "joes cafe"
+    assert normalize_name("Fish & Chips") == "fish and chips"
+
+
+def test_non_latin_names_are_kept():
+    index = VendorIndex(["寿司", "مطعم", "Кафе Пушкин"])
+
+    assert len(index) == 3
+    assert "寿司" in index
+    assert "مطعم" in index
+    assert "КАФЕ ПУШКИН" in index
+    assert "ラーメン" not in index
+
+
+def test_arabic_diacritics_are_ignored():
+    assert normalize_name("مَطْعَم") == normalize_name("مطعم")
+
+
+def test_discard_removes_the_name_and_its_trigrams():
+    index = VendorIndex(["Joe's Cafe"], fuzzy=True)
+    index.discard("JOES CAFE")
+
+    assert "Joe's Cafe" not in index
+    assert index.find_similar("Joes Cafe") == []
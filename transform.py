@@ -0,0 +1,139 @@
+import re
+import pandas as pd
+
+# UK postcode, including the special GIR 0AA
+UK_POSTCODE_PATTERN = r"([Gg][Ii][Rr] 0[Aa]{2})|((([A-Za-z][0-9]{1,2})|(([A-Za-z][A-Ha-hJ-Yj-y][0-9]{1,2})|(([A-Za-z][0-9][A-Za-z])|([A-Za-z][A-Ha-hJ-Yj-y][0-9][A-Za-z]?))))\s?[0-9][A-Za-z]{2})"
+
+# Columns added by transform_chunk
+POSTCODE_COLUMN = "Postcode"
+HD_IMAGE_COLUMN = "HD Image"
+HOURS_KEY_COLUMN = "Hours Key"
+LAT_COLUMN = "Lat"
+LON_COLUMN = "Lon"
+
+# Export thumbnails are ~80px wide and are scaled 7x at ingestion
+TARGET_IMAGE_WIDTH = 560
+IMAGE_SIZE_PATTERNS = (
+    (re.compile(r"w(\d+)-h(\d+)"), "w{}-h{}"),
+    (re.compile(r"w=(\d+)&h=(\d+)"), "w={}&h={}"),
+)
+
+
+def first_phone(phones: pd.Series, remove_spaces: bool = True) -> pd.Series:
+    """
+    :param phones: The 'Phones' column (comma separated numbers).
+    :param remove_spaces: Remove the spaces inside the number.
+    :return: The first number of each row.
+    """
+    # Missing numbers stay NaN under pandas' string dtype, they become "" like other blanks
+    first = phones.astype(str).str.split(",").str[0].fillna("")
+    return first.str.replace(" ", "", regex=False) if remove_spaces else first
+
+
+def strip_spaces(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.replace(" ", "", regex=False)
+
+
+def extract_postcodes(addresses: pd.Series, pattern: str = UK_POSTCODE_PATTERN) -> pd.Series:
+    """
+    :param addresses: The 'Fulladdress' column.
+    :param pattern: Postcode regular expression.
+    :return: The first postcode found in each address, or None.
+    """
+    postcodes = addresses.astype(str).str.extract(f"({pattern})", expand=True)[0]
+    return postcodes.astype(object).where(postcodes.notna(), None)
+
+
+def _scale_dimensions(urls: pd.Series, pattern: str, template: tuple, scale_factor: int, todo: pd.Series):
+    # Splits each URL around the first w/h match and rebuilds it with scaled sizes
+    parts = urls[todo].str.extract(f"^(?P<pre>.*?){pattern}(?P<post>.*)$")
+    matched = parts["w"].notna()
+    parts = parts[matched]
+
+    width = (pd.to_numeric(parts["w"]) * scale_factor).astype("int64").astype(str)
+    height = (pd.to_numeric(parts["h"]) * scale_factor).astype("int64").astype(str)
+    w_prefix, h_prefix = template
+    size = w_prefix + width + h_prefix + height
+
+    # Later matches get the first one's scaled size too, like re.sub did (rare, done per row)
+    post = parts["post"].astype(object)
+    repeated = post.str.contains(re.sub(r"\(\?P<\w+>", "(?:", pattern))
+    if repeated.any():
+        regex = re.compile(pattern)
+        post[repeated] = [regex.sub(lambda _, s=s: s, p) for s, p in zip(size[repeated], post[repeated])]
+    return parts["pre"] + size + post
+
+
+def resize_google_image_urls(urls: pd.Series, scale_factor: int = 7, query_pattern: bool = True) -> pd.Series:
+    """
+    Multiplies the `w80-h80` (and optionally `w=80&h=80`) dimensions of every URL
+    by `scale_factor`. The first match gives the new size and every match of the
+    same form is set to it, URLs with `w80-h80` are not checked for `w=80&h=80`.
+
+    :param urls: The 'Featured Image' column.
+    :param scale_factor: The factor by which to multiply the dimensions.
+    :param query_pattern: Also handle the `w=80&h=80` form.
+    :return: Series with the modified URLs, unmatched URLs are returned unchanged.
+    """
+    urls = urls.astype(str)
+    result = urls.copy()
+
+    todo = pd.Series(True, index=urls.index)
+    resized = _scale_dimensions(urls, r"w(?P<w>\d+)-h(?P<h>\d+)", ("w", "-h"), scale_factor, todo)
+    result.loc[resized.index] = resized
+
+    if query_pattern:
+        # Only URLs without `w80-h80`
+        todo = pd.Series(~urls.index.isin(resized.index), index=urls.index)
+        resized = _scale_dimensions(urls, r"w=(?P<w>\d+)&h=(?P<h>\d+)", ("w=", "&h="), scale_factor, todo)
+        result.loc[resized.index] = resized
+
+    return result
+
+
+def image_url_at_width(image_url: str, width: int = TARGET_IMAGE_WIDTH) -> str:
+    """
+    Sets the dimensions of a Google image URL to `width`, keeping its aspect ratio.
+
+    Unlike resize_google_image_urls this is idempotent: a URL already at the
+    target width is returned unchanged, and URLs that were scaled more than
+    once are brought back down to the target.
+
+    :param image_url: The Google image URL.
+    :param width: The target width in pixels.
+    :return: The URL with updated dimensions, unmatched URLs are returned unchanged.
+    """
+    for pattern, template in IMAGE_SIZE_PATTERNS:
+        match = pattern.search(image_url)
+        if match:
+            current_width, current_height = int(match.group(1)), int(match.group(2))
+            if current_width == width or not current_width:
+                return image_url
+            height = round(current_height * width / current_width)
+            return image_url[:match.start()] + template.format(width, height) + image_url[match.end():]
+    return image_url
+
+
+def transform_chunk(df: pd.DataFrame, postcode_pattern: str = UK_POSTCODE_PATTERN, scale_factor: int = 7, query_pattern: bool = True) -> pd.DataFrame:
+    """
+    Computes every derived column of a chunk at once, so the upload loop only
+    assembles documents.
+
+    Updates 'Phones' (first number, no spaces) and 'Phone' (no spaces), and adds
+    'Postcode', 'HD Image', 'Hours Key' (normalized 'Opening Hours' string) and
+    float 'Lat' / 'Lon' (NaN when the value is not a number).
+
+    :param df: Chunk with the selected G-Maps columns, missing values filled with "".
+    :param postcode_pattern: Postcode regular expression.
+    :param scale_factor: The factor by which to multiply the image dimensions.
+    :param query_pattern: Also resize `w=80&h=80` image URLs.
+    :return: The same DataFrame with the derived columns.
+    """
+    df["Phones"] = first_phone(df["Phones"])
+    df["Phone"] = strip_spaces(df["Phone"])
+    df[POSTCODE_COLUMN] = extract_postcodes(df["Fulladdress"], postcode_pattern)
+    df[HD_IMAGE_COLUMN] = resize_google_image_urls(df["Featured Image"], scale_factor, query_pattern)
+    df[HOURS_KEY_COLUMN] = df["Opening Hours"].astype(str).str.replace("\u202f", " ", regex=False)
+    df[LAT_COLUMN] = pd.to_numeric(df["Latitude"], errors="coerce")
+    df[LON_COLUMN] = pd.to_numeric(df["Longitude"], errors="coerce")
+    return df
@@ -0,0 +1,139 @@
+import json
+import re
+import unicodedata
+from name_export import iter_names
+
+# Legal suffixes that do not distinguish one business from another
+NAME_STOPWORDS = {"ltd", "limited", "plc", "llp", "llc", "inc", "uk"}
+
+# Letters of every script are kept, only punctuation, symbols and spaces separate tokens
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Builds the dedupe key of a vendor name.
+
+    Case, accents, punctuation, "&" vs "and" and legal suffixes such as "Ltd" are
+    ignored, so "Joe's Café Ltd." and "JOES CAFE" share the key "joes cafe".
+    Names in other scripts keep their letters ("寿司" stays "寿司").
+
+    :param name: The vendor name.
+    :return: The normalized key ("" for empty names).
+    """
+    if not isinstance(name, str):
+        return ""
+    # Only the accents are dropped, not the letters they sit on
+    name = "".join(char for char in unicodedata.normalize("NFKD", name) if not unicodedata.combining(char))
+    name = name.casefold().replace("&", " and ").replace("'", "")
+    tokens = [token for token in _NON_ALNUM.split(name) if token and token not in NAME_STOPWORDS]
+    return " ".join(tokens)
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class VendorIndex:
+    """
+    Set of normalized vendor names with O(1) exact lookups.
+
+    With `fuzzy=True` a trigram blocking index is kept as well, so near-duplicate
+    candidates are found without comparing a name against every vendor.
+    """
+
+    def __init__(self, names=(), fuzzy: bool = False):
+        """
+        :param names: Iterable of vendor names to index.
+        :param fuzzy: Whether to maintain the trigram index for `find_similar`.
+        """
+        self.fuzzy = fuzzy
+        self._keys = set()
+        self._grams = {}
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_json_file(cls, filename: str, fuzzy: bool = False):
+        """
+        Loads names saved by get_business_names.py (a JSON list of names).
+
+        :param filename: The JSON file with the list of names.
+        :param fuzzy: Whether to maintain the trigram index.
+        :return: The VendorIndex.
+        """
+        with open(filename, "r") as json_file:
+            return cls(json.load(json_file), fuzzy=fuzzy)
+
+    @classmethod
+    def from_file(cls, filename: str, fuzzy: bool = False):
+        """
+        Loads a name list in any format written by get_business_names.py: a JSON
+        list (`.json`), a JSONL export (`.jsonl`) or a binary name index (`.bin`).
+
+        :param filename: The export file.
+        :param fuzzy: Whether to maintain the trigram index.
+        :return: The VendorIndex.
+        """
+        if filename.endswith(".json"):
+            return cls.from_json_file(filename, fuzzy)
+        return cls(iter_names(filename), fuzzy=fuzzy)
+
+    def add(self, name: str):
+        key = normalize_name(name)
+        if not key or key in self._keys:
+            return
+        self._keys.add(key)
+        if self.fuzzy:
+            for gram in _trigrams(key):
+                self._grams.setdefault(gram, set()).add(key)
+
+    def discard(self, name: str):
+        key = normalize_name(name)
+        if key not in self._keys:
+            return
+        self._keys.discard(key)
+        if self.fuzzy:
+            for gram in _trigrams(key):
+                self._grams.get(gram, set()).discard(key)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def find_similar(self, name: str, threshold: float = 0.7, limit: int = 5) -> list:
+        """
+        Finds indexed names that look like `name`.
+
+        Only keys sharing trigrams with `name` are scored (Jaccard similarity of
+        their trigram sets).
+
+        :param name: The vendor name.
+        :param threshold: Minimum similarity between 0 and 1.
+        :param limit: Maximum number of candidates returned.
+        :return: List of (key, similarity) tuples, best match first.
+        """
+        if not self.fuzzy:
+            raise ValueError("VendorIndex was built without fuzzy=True")
+
+        key = normalize_name(name)
+        grams = _trigrams(key)
+        shared = {}
+        for gram in grams:
+            for candidate in self._grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        scored = []
+        for candidate, count in shared.items():
+            # Cheap upper bound before computing the candidate trigram set
+            if count / len(grams) < threshold:
+                continue
+            similarity = count / len(grams | _trigrams(candidate))
+            if similarity >= threshold:
+                scored.append((candidate, similarity))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
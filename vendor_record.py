@@ -0,0 +1,146 @@
+import functools
+import json
+
+from transform import HD_IMAGE_COLUMN, LAT_COLUMN, LON_COLUMN, POSTCODE_COLUMN
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Fields every extracted vendor starts with, built once per process. The nested
+# maps are shared by all documents, they are only serialized and must not be modified.
+VENDOR_TEMPLATE = {
+    "active": True,
+    "city": "London",
+    "country": "United Kingdom",
+    "dynamicLink": "",
+    "isVerified": True,
+    "qrCode": "",
+    "rating": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0, "count": 0, "rating": 0},
+    "ratings": [],
+    "socialLinks": {"facebookId": "", "instaId": ""},
+    "state": "NA",
+    "extracted": True,
+    "claimed": False,
+    "workingDays": {day: True for day in WEEKDAYS},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def firestore_template(firestore) -> dict:
+    """
+    :param firestore: The firebase_admin.firestore module (passed in so the SDK is not imported here).
+    :return: VENDOR_TEMPLATE with the server timestamps, shared and not to be modified.
+    """
+    # updatedAt is the write time vendor_sync pages on, startTime/endTime are business hours owners edit
+    return {**VENDOR_TEMPLATE, "startTime": firestore.SERVER_TIMESTAMP, "endTime": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP}
+
+
+class VendorRecord:
+    """
+    The variable fields of a vendor, everything else comes from VENDOR_TEMPLATE.
+
+    Only the Firestore documents are built from it. The file exports of main.py
+    keep the CSV columns as they are, row by row through JsonRecordTemplate.
+
+        record = VendorRecord.from_row(row, opening_hours, email, additional_emails)
+        writer.set(doc_ref, record.to_firestore(doc_ref.id, firestore))
+    """
+
+    __slots__ = ("name", "address", "category", "contact", "description", "email", "additional_emails", "image",
+                 "latitude", "longitude", "lat", "lon", "line1", "opening_hours", "phone", "pincode", "website", "place_id")
+
+    def __init__(self, name, address, category, contact, description, email, additional_emails, image,
+                 latitude, longitude, lat, lon, line1, opening_hours, phone, pincode, website, place_id):
+        self.name = name
+        self.address = address
+        self.category = category
+        self.contact = contact
+        self.description = description
+        self.email = email
+        self.additional_emails = additional_emails
+        self.image = image
+        self.latitude = latitude
+        self.longitude = longitude
+        self.lat = lat
+        self.lon = lon
+        self.line1 = line1
+        self.opening_hours = opening_hours
+        self.phone = phone
+        self.pincode = pincode
+        self.website = website
+        self.place_id = place_id
+
+    @classmethod
+    def from_row(cls, row: dict, opening_hours: dict, email: str = None, additional_emails: str = None, category: str = None):
+        """
+        :param row: A row of a transformed chunk (see transform.transform_chunk).
+        :param opening_hours: The compiled openingHours map of the row.
+        :param email: The first email found on the website, or None.
+        :param additional_emails: The other emails, comma separated, or None.
+        :param category: Category of the vendor, defaults to the row's `Categories`.
+        """
+        return cls(row["Name"], row["Fulladdress"], row["Categories"] if category is None else category, row["Phones"], row["Description"], email or "",
+                   additional_emails or "", row[HD_IMAGE_COLUMN], row["Latitude"], row["Longitude"], row[LAT_COLUMN],
+                   row[LON_COLUMN], row["Street"], opening_hours, row["Phone"], row[POSTCODE_COLUMN], row["Website"],
+                   row["Place Id"])
+
+    def to_firestore(self, doc_id: str, firestore) -> dict:
+        """
+        :param doc_id: ID of the vendor document, also used as its ownerId/uid.
+        :param firestore: The firebase_admin.firestore module.
+        :return: The vendor document.
+        """
+        doc = firestore_template(firestore).copy()
+        doc["address"] = self.address
+        doc["category"] = self.category
+        doc["contact"] = self.contact
+        doc["description"] = self.description
+        doc["email"] = self.email
+        doc["additional_emails"] = self.additional_emails
+        doc["images"] = [self.image]
+        doc["latitude"] = self.latitude
+        doc["line1"] = self.line1
+        doc["longitude"] = self.longitude
+        doc["name"] = self.name
+        doc["openingHours"] = self.opening_hours
+        doc["phone"] = self.phone
+        doc["pincode"] = self.pincode
+        doc["website"] = self.website
+        doc["google_place_id"] = self.place_id
+        doc["location"] = firestore.GeoPoint(self.lat, self.lon)
+        doc["ownerId"] = doc_id
+        doc["uid"] = doc_id
+        return doc
+
+
+class JsonRecordTemplate:
+    """
+    Formats flat records exactly like `json.dumps(record, indent=4)` nested one level deep,
+    or like `json.dumps(record, separators=(",", ":"))` with `indent=None`.
+
+    The keys and layout are encoded once, only the values are encoded per row,
+    so rows can be written straight from a chunk's value arrays without a dict each.
+
+        template = JsonRecordTemplate(columns)
+        for values in df[columns].to_numpy(dtype=object):
+            f.write(template.encode(values))
+    """
+
+    def __init__(self, columns: list, indent: int = 4, level: int = 1):
+        self.columns = tuple(columns)
+        # Keys are escaped for %-formatting, values are substituted as they are
+        keys = [json.dumps(column).replace("%", "%%") for column in self.columns]
+        if indent is None:
+            self._format = "{" + ",".join(key + ":%s" for key in keys) + "}"
+        else:
+            outer = "\n" + " " * (indent * level)
+            inner = outer + " " * indent
+            self._format = "{" + inner + ("," + inner).join(key + ": %s" for key in keys) + outer + "}" if keys else "{}"
+        self._encode = json.JSONEncoder().encode
+
+    def encode(self, values) -> str:
+        """
+        :param values: The row values, in column order.
+        :return: The JSON object text.
+        """
+        return self._format % tuple(map(self._encode, values))
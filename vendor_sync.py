@@ -0,0 +1,105 @@
+import datetime
+import json
+import os
+import time
+
+DEFAULT_SNAPSHOT_FILE = "vendor_snapshot.json"
+SNAPSHOT_FIELDS = ["name", "google_place_id"]
+
+# Every vendor write sets this field to SERVER_TIMESTAMP (see vendor_record), it drives the
+# incremental cursor. Not startTime: that is an opening time owners can set in the future
+CURSOR_FIELD = "updatedAt"
+
+# Renames and deletions are not visible to the cursor, reload everything once in a while
+FULL_REFRESH_AGE = 7 * 24 * 3600  # 7 days
+
+
+class VendorSnapshot:
+    """
+    Local snapshot of the keys (name and place ID) of the vendors collection.
+
+    The first load downloads only the projected fields of every vendor. Later
+    refreshes only query documents whose cursor field is newer than the last one
+    seen, so startup cost follows the number of new vendors, not the collection size.
+    Vendors written without the cursor field only show up on the full reload
+    done every FULL_REFRESH_AGE.
+    """
+
+    def __init__(self, filename: str = DEFAULT_SNAPSHOT_FILE, collection_name: str = "vendors"):
+        """
+        :param filename: JSON file the snapshot is persisted to.
+        :param collection_name: The Firestore collection to mirror.
+        """
+        self.filename = filename
+        self.collection_name = collection_name
+        self.vendors = {}
+        self.cursor = None
+        self.full_at = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self.vendors = data.get("vendors", {})
+        # A cursor read from another field is meaningless, the next refresh reloads everything
+        if data.get("cursor") and data.get("cursor_field") == CURSOR_FIELD:
+            self.cursor = datetime.datetime.fromisoformat(data["cursor"])
+        self.full_at = data.get("full_at", 0)
+
+    def save(self):
+        data = {
+            "cursor": self.cursor.isoformat() if self.cursor else None,
+            "cursor_field": CURSOR_FIELD,
+            "full_at": self.full_at,
+            "vendors": self.vendors,
+        }
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_filename, self.filename)
+
+    def _apply(self, docs) -> int:
+        count = 0
+        for doc in docs:
+            data = doc.to_dict()
+            self.vendors[doc.id] = [data.get("name"), data.get("google_place_id")]
+            cursor = data.get(CURSOR_FIELD)
+            if isinstance(cursor, datetime.datetime) and (self.cursor is None or cursor > self.cursor):
+                self.cursor = cursor
+            count += 1
+        return count
+
+    def refresh(self, db, full: bool = False) -> int:
+        """
+        Brings the snapshot up to date and saves it.
+
+        :param db: The Firestore client.
+        :param full: Force a full reload instead of an incremental one.
+        :return: Number of documents downloaded.
+        """
+        collection = db.collection(self.collection_name)
+        full = full or self.cursor is None or time.time() - self.full_at > FULL_REFRESH_AGE
+
+        if full:
+            print("== Loading vendor snapshot from Firebase ==")
+            self.vendors = {}
+            self.cursor = None
+            query = collection.select(SNAPSHOT_FIELDS + [CURSOR_FIELD])
+            self.full_at = time.time()
+        else:
+            print(f"== Refreshing vendor snapshot since {self.cursor} ==")
+            query = collection.where(CURSOR_FIELD, ">", self.cursor).select(SNAPSHOT_FIELDS + [CURSOR_FIELD])
+
+        count = self._apply(query.stream())
+        self.save()
+        return count
+
+    def names(self) -> list:
+        return [name for name, _ in self.vendors.values() if name]
+
+    def place_ids(self) -> set:
+        return {place_id for _, place_id in self.vendors.values() if place_id}